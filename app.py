@@ -14,13 +14,24 @@ app.config['SQLALCHEMY_DATABASE_URI'] = os.environ.get('DATABASE_URL') or 'sqlit
 app.config['SQLALCHEMY_TRACK_MODIFICATIONS'] = False
 app.config['JWT_SECRET_KEY'] = 'segredo-jwt-muito-fortissimo'
 app.config['JWT_ACCESS_TOKEN_EXPIRES'] = timedelta(hours=1)
+# Backend compartilhado do cache de respostas ('modulo:fabrica' de um cache.SharedCache,
+# ex.: Redis); sem ele, cada worker usa só o próprio LRU
+app.config['RESPONSE_CACHE_BACKEND'] = os.environ.get('RESPONSE_CACHE_BACKEND')
 
 # --- Inicialização de extensões ---
 from models import db  # Agora importamos db de models
+from search import include_object
 db.init_app(app)  # Inicializar db com o app
-migrate = Migrate(app, db)
+migrate = Migrate(app, db, include_object=include_object)  # Ignora os objetos de busca fora do modelo
 jwt = JWTManager(app)
 
+# Serialização JSON com orjson, se instalado
+from serialization import configure_json
+configure_json(app)
+
+# Pub/sub dos feeds SSE (em memória por padrão; ver events.set_broker)
+from events import get_broker
+
 # Configurar CORS mais específico
 CORS(app, resources={
     r"/*": {
@@ -77,7 +88,14 @@ def edit_service_page():
 # Rota de health check
 @app.route('/health')
 def health_check():
-    return jsonify({"status": "healthy", "message": "Flask app is running"})
+    return jsonify({
+        "status": "healthy",
+        "message": "Flask app is running",
+        "categoryCache": category_cache.stats(),
+        "facetCache": facet_cache.stats(),
+        "eventBroker": get_broker().stats(),
+        "responseCache": response_cache.stats()
+    })
 
 # Importar e registrar blueprints APÓS a criação do app
 with app.app_context():
@@ -85,12 +103,19 @@ with app.app_context():
     from models import User, Service, Category, Document
     
     # Agora importar os blueprints
-    from routes import auth_bp, service_bp, user_bp
+    from routes import (auth_bp, service_bp, user_bp, category_bp, category_cache, facet_cache, response_cache,
+                        configure_response_cache, warm_category_cache)
     
     # Registrar Blueprints
     app.register_blueprint(auth_bp)
     app.register_blueprint(service_bp)
     app.register_blueprint(user_bp)
+    app.register_blueprint(category_bp)
+
+    # Pré-carregar o cache de categorias deste worker
+    warm_category_cache()
+
+    configure_response_cache(app.config['RESPONSE_CACHE_BACKEND'])
 
 if __name__ == '__main__':
     app.run(debug=True, port=5000)
\ No newline at end of file
@@ -0,0 +1,63 @@
+# bench/common.py
+# Base dos benchmarks de bench/. Cada script usa um banco SQLite próprio no
+# diretório temporário (ou o banco de DATABASE_URL), populado só na primeira
+# execução: as execuções seguintes medem sem pagar a carga de novo.
+#
+#   python bench/fuzzy_search.py
+#   python bench/fuzzy_search.py --reset   # apaga e popula o banco de novo
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def open_database(name):
+    """Aponta a app para o banco do benchmark 'name'; devolve True se ele precisa ser populado.
+
+    Deve ser chamada antes de importar app/models: a URL do banco é lida na importação.
+    """
+    if ROOT not in sys.path:
+        sys.path.insert(0, ROOT)
+    if os.environ.get('DATABASE_URL'):
+        return '--reset' in sys.argv
+    path = os.path.join(tempfile.gettempdir(), f'chronora-bench-{name}.db')
+    if '--reset' in sys.argv and os.path.exists(path):
+        os.remove(path)
+    os.environ['DATABASE_URL'] = f'sqlite:///{path}'
+    return not os.path.exists(path)
+
+
+def create_schema_and_owner():
+    """Recria as tabelas e devolve o id de um usuário dono dos serviços gerados."""
+    from models import db, User
+
+    db.drop_all()
+    db.create_all()
+    owner = User(name='Benchmark', email='bench@example.com', phone_number=11999999999)
+    owner.set_password('123456')
+    db.session.add(owner)
+    db.session.commit()
+    return owner.id
+
+
+def measure(fn, repeat):
+    """Tempos de 'repeat' chamadas de fn(), em milissegundos."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return samples
+
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def summary(samples):
+    return (f'p50 {statistics.median(samples):8.1f} ms   '
+            f'p95 {percentile(samples, 0.95):8.1f} ms   max {max(samples):8.1f} ms')
@@ -0,0 +1,83 @@
+# bench/fuzzy_search.py
+# Busca aproximada (TrigramIndex, SQLite) sobre 100 mil serviços: tempo de carga
+# do índice e p95 das buscas com erros de digitação, só no índice e de ponta a
+# ponta (fuzzy_search), e também enquanto outra thread recarrega o índice
+# inteiro: as buscas seguem no índice anterior em vez de esperar a recarga.
+import random
+import threading
+import time
+
+from common import open_database, create_schema_and_owner, measure, summary
+
+SERVICES = 100_000
+CATEGORIES = 300
+QUERIES = 200
+
+needs_seed = open_database('fuzzy-search')
+
+from app import app
+from models import db, Service, Category, service_categories, service_read_options
+from normalization import normalize_for_search
+from search import trigram_index, fuzzy_search
+
+rnd = random.Random(2)
+SYLLABLES = ['ma', 'nu', 'ten', 'cao', 'pin', 'tu', 'ra', 'jar', 'di', 'na', 'gem', 'au', 'la', 'vi', 'o', 'lao',
+             'lim', 'pe', 'za', 'fo', 'to', 'gra', 'fi', 'a', 'co', 'zi', 'nha', 're', 'for', 'ele', 'tri', 'ca']
+vocabulary = sorted({''.join(rnd.choices(SYLLABLES, k=rnd.randint(2, 4))) for _ in range(30_000)})
+rnd.shuffle(vocabulary)
+weights = [1 / (rank + 1) ** 0.8 for rank in range(len(vocabulary))]  # Frequência tipo Zipf
+
+
+def seed():
+    owner_id = create_schema_and_owner()
+    db.session.add_all([Category(name=f'Categoria {word}') for word in vocabulary[:CATEGORIES]])
+    db.session.flush()
+    connection = db.session.connection()
+    rows = []
+    for _ in range(SERVICES):
+        title = ' '.join(rnd.choices(vocabulary, weights, k=4))
+        rows.append(dict(title=title, description='Descrição', search_title=normalize_for_search(title),
+                         search_body='descricao', time_chronos=1, user_id=owner_id,
+                         service_image=b'x', image_hash='0' * 64))
+    connection.execute(Service.__table__.insert(), rows)
+    connection.execute(service_categories.insert(), [
+        dict(service_id=service_id, category_id=rnd.randint(1, CATEGORIES))
+        for service_id in range(1, SERVICES + 1)
+    ])
+    db.session.commit()
+
+
+def misspell(word):
+    position = rnd.randrange(len(word))
+    return word[:position] + rnd.choice('aeioumnr') + word[position + 1:]
+
+
+with app.app_context():
+    if needs_seed:
+        seed()
+    queries = [' '.join(misspell(word) for word in rnd.choices(vocabulary, weights, k=rnd.randint(1, 2)))
+               for _ in range(QUERIES)]
+    build = measure(lambda: trigram_index.search('carga', 0.3), 1)[0]
+    print(f'{SERVICES} serviços; carga do índice {build:.0f} ms')
+
+    print('índice         ', summary([sample for text in queries
+                                      for sample in measure(lambda: trigram_index.search(text, 0.3), 1)]))
+    query = Service.query.options(*service_read_options())
+    print('ponta a ponta  ', summary([sample for text in queries
+                                      for sample in measure(lambda: fuzzy_search(query, text, 0.3, 20), 1)]))
+
+    # Recarga em outra thread: força o vencimento e mede as buscas enquanto ela roda
+    def rebuild():
+        with app.app_context():
+            trigram_index.search('recarga', 0.3)
+
+    trigram_index._built_at -= trigram_index.REBUILD_INTERVAL + 1
+    rebuilding = threading.Thread(target=rebuild)
+    rebuilding.start()
+    while not trigram_index._update_lock.locked():
+        time.sleep(0.001)
+    during = []
+    while rebuilding.is_alive():
+        during.extend(measure(lambda: trigram_index.search(rnd.choice(queries), 0.3), 1))
+    rebuilding.join()
+    print('durante recarga', summary(during), f'({len(during)} buscas)')
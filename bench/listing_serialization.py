@@ -0,0 +1,89 @@
+# bench/listing_serialization.py
+# Listagem de 10 mil serviços (2 categorias cada): carga + to_dict() pelo ORM e
+# pelas linhas/DTOs de serialization.py, e JSON pelo provedor padrão do Flask e
+# pelo ORJSONProvider. Confere antes que os dois caminhos produzem a mesma saída.
+import datetime
+import json
+import random
+import statistics
+import sys
+
+from common import open_database, create_schema_and_owner, measure
+
+SERVICES = 10_000
+CATEGORIES = 200
+REPEAT = 7
+
+needs_seed = open_database('serialization')
+
+from flask.json.provider import DefaultJSONProvider
+from flask_jwt_extended import create_access_token
+
+from app import app
+from models import db, Service, Category, service_categories, service_read_options
+from normalization import normalize_for_search
+from serialization import ORJSONProvider, orjson, service_rows_query, service_dtos
+
+if orjson is None:
+    sys.exit('orjson não está instalado')
+
+rnd = random.Random(4)
+
+
+def seed():
+    owner_id = create_schema_and_owner()
+    db.session.add_all([Category(name=f'Categoria {i}') for i in range(CATEGORIES)])
+    db.session.flush()
+    connection = db.session.connection()
+    rows = []
+    for i in range(SERVICES):
+        title = f'Serviço de pintura número {i}'
+        description = 'Descrição com acentuação e texto suficiente para um card ' * 3
+        rows.append(dict(title=title, description=description, search_title=normalize_for_search(title),
+                         search_body=normalize_for_search(description), time_chronos=rnd.randint(1, 100),
+                         modality=rnd.choice(['Presencial', 'Remoto', 'Híbrido', None]),
+                         deadline=datetime.date(2026, 1, 1) + datetime.timedelta(days=rnd.randint(0, 300)),
+                         user_id=owner_id, service_image=b'x' * 2000, image_hash='0' * 64))
+    connection.execute(Service.__table__.insert(), rows)
+    connection.execute(service_categories.insert(), [
+        dict(service_id=service_id, category_id=category_id)
+        for service_id in range(1, SERVICES + 1)
+        for category_id in rnd.sample(range(1, CATEGORIES + 1), 2)
+    ])
+    db.session.commit()
+
+
+def median(fn):
+    return statistics.median(measure(fn, REPEAT))
+
+
+def load_orm():
+    db.session.expunge_all()
+    return [service.to_dict() for service in Service.query.options(*service_read_options()).order_by(Service.id)]
+
+
+def load_dto():
+    return [service.to_dict() for service in service_dtos(service_rows_query().order_by(Service.id).all())]
+
+
+with app.app_context():
+    if needs_seed:
+        seed()
+
+with app.test_request_context():
+    standard, fast = DefaultJSONProvider(app), ORJSONProvider(app)
+    items = load_orm()
+    assert items == load_dto(), 'ORM e DTO produzem saídas diferentes'
+    assert json.loads(standard.response(items).get_data()) == json.loads(fast.response(items).get_data())
+
+    print(f'{SERVICES} serviços (2 categorias cada), mediana de {REPEAT}:')
+    print(f'  carga + to_dict   ORM    {median(load_orm):7.1f} ms   DTO    {median(load_dto):7.1f} ms')
+    print(f'  JSON              padrão {median(lambda: standard.response(items).get_data()):7.1f} ms   '
+          f'orjson {median(lambda: fast.response(items).get_data()):7.1f} ms')
+    print(f'  total             antes  {median(lambda: standard.response(load_orm()).get_data()):7.1f} ms   '
+          f'depois {median(lambda: fast.response(load_dto()).get_data()):7.1f} ms')
+
+client = app.test_client()
+with app.app_context():
+    headers = {'Authorization': 'Bearer ' + create_access_token(identity='1')}
+print(f'  GET /service/get/all          {median(lambda: client.get("/service/get/all", headers=headers).data):7.1f} ms')
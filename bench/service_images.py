@@ -0,0 +1,63 @@
+# bench/service_images.py
+# Serviços com imagens de 1 MB: memória (pico do tracemalloc) e tempo de carregar e
+# serializar a listagem com a imagem carregada junto (undefer) e com a coluna
+# adiada, como as rotas fazem; e o tempo de GET /service/<id>/image, a única
+# leitura que precisa dos bytes.
+import os
+import statistics
+import tracemalloc
+
+from common import open_database, create_schema_and_owner, measure
+
+SERVICES = 100
+IMAGE_SIZE = 1 << 20
+REPEAT = 5
+
+needs_seed = open_database('service-images')
+
+from flask_jwt_extended import create_access_token
+
+from app import app
+from models import db, Service, service_read_options
+
+
+def seed():
+    owner_id = create_schema_and_owner()
+    for i in range(SERVICES):
+        service = Service(title=f'Serviço {i}', description='Descrição', time_chronos=1, user_id=owner_id)
+        service.set_image(os.urandom(IMAGE_SIZE))
+        db.session.add(service)
+    db.session.commit()
+
+
+def load_listing(options):
+    db.session.expunge_all()
+    return [service.to_dict() for service in Service.query.options(*options).order_by(Service.id)]
+
+
+def profile(options):
+    """(mediana em ms, pico de memória em MB) de carregar e serializar a listagem."""
+    times, peaks = [], []
+    for _ in range(REPEAT):
+        tracemalloc.start()
+        times.extend(measure(lambda: load_listing(options), 1))
+        peaks.append(tracemalloc.get_traced_memory()[1] / 1e6)
+        tracemalloc.stop()
+    return statistics.median(times), max(peaks)
+
+
+with app.app_context():
+    if needs_seed:
+        seed()
+    print(f'{SERVICES} serviços com imagem de {IMAGE_SIZE // 1024} KB')
+    for name, options in [('imagem carregada', [*service_read_options(), db.undefer(Service.service_image)]),
+                          ('imagem adiada', service_read_options())]:
+        elapsed, peak = profile(options)
+        print(f'  listagem, {name:17} {elapsed:7.1f} ms   pico {peak:7.1f} MB')
+
+    client = app.test_client()
+    headers = {'Authorization': 'Bearer ' + create_access_token(identity='1')}
+    listing = measure(lambda: client.get('/service/get/all', headers=headers).data, REPEAT)
+    print(f'  GET /service/get/all          {statistics.median(listing):7.1f} ms')
+    image = measure(lambda: client.get('/service/1/image', headers=headers).data, REPEAT)
+    print(f'  GET /service/1/image          {statistics.median(image):7.1f} ms')
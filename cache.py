@@ -0,0 +1,290 @@
+# cache.py
+# Caches em memória do processo (um por worker) e o cache de respostas, que pode
+# usar também um backend compartilhado entre workers.
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from datetime import datetime
+
+
+class TTLCache:
+    """Cache LRU com tempo de vida (TTL) e limite de itens, seguro entre threads.
+
+    Ao passar de 'maxsize' itens, o menos usado recentemente é descartado. Os
+    contadores de acertos/erros são do worker atual. Com 'sizeof' (ex.:
+    sys.getsizeof), o total ocupado pelos valores aparece em stats()['bytes'].
+    """
+
+    def __init__(self, maxsize, ttl, clock=time.monotonic, sizeof=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._clock = clock
+        self._sizeof = sizeof
+        self._data = OrderedDict()  # chave -> (expira_em, valor)
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _account(self, value, sign):
+        if self._sizeof is not None:
+            self._bytes += sign * self._sizeof(value)
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self._clock():
+                if entry is not None:
+                    del self._data[key]
+                    self._account(entry[1], -1)
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, key, value):
+        with self._lock:
+            previous = self._data.get(key)
+            if previous is not None:
+                self._account(previous[1], -1)
+            self._data[key] = (self._clock() + self.ttl, value)
+            self._account(value, 1)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._account(self._data.popitem(last=False)[1][1], -1)
+
+    def pop(self, key):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return None
+            self._account(entry[1], -1)
+            return entry[1]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self):
+        """Tamanho e contadores de acerto/erro deste worker."""
+        total = self.hits + self.misses
+        stats = {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRatio': round(self.hits / total, 4) if total else None,
+        }
+        if self._sizeof is not None:
+            stats['bytes'] = self._bytes
+        return stats
+
+
+class SharedCache(ABC):
+    """Interface de um cache compartilhado entre workers (ex.: Redis).
+
+    Chaves são strings e valores, bytes; 'ttl' em segundos. incr() e
+    set_if_equal() precisam ser atômicos (no Redis: INCR e WATCH/MULTI ou um
+    script Lua). Uma implementação incompleta falha ao ser instanciada.
+    """
+
+    @abstractmethod
+    def get(self, key):
+        """Valor de 'key', ou None se ausente ou expirado."""
+
+    @abstractmethod
+    def set(self, key, value, ttl):
+        """Grava 'key' com expiração em 'ttl' segundos."""
+
+    @abstractmethod
+    def delete(self, key):
+        """Remove 'key', se existir."""
+
+    @abstractmethod
+    def incr(self, key):
+        """Soma 1 ao contador 'key' (sem expiração), criando-o se preciso."""
+
+    @abstractmethod
+    def set_if_equal(self, guard_key, expected, key, value, ttl):
+        """Grava 'key' só se 'guard_key' ainda valer 'expected' (compare-and-set); True se gravou."""
+
+    def stats(self):
+        return {}
+
+
+class LocalSharedCache(SharedCache):
+    """Dublê em memória de um SharedCache, para testes e desenvolvimento."""
+
+    def __init__(self, clock=time.monotonic):
+        self._clock = clock
+        self._data = {}  # chave -> (expira_em, valor)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[0] <= self._clock():
+                self._data.pop(key, None)
+                return None
+            return entry[1]
+
+    def set(self, key, value, ttl):
+        with self._lock:
+            self._data[key] = (self._clock() + ttl, value)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def _current(self, key):
+        entry = self._data.get(key)
+        return entry[1] if entry is not None and entry[0] > self._clock() else None
+
+    def incr(self, key):
+        with self._lock:
+            value = int(self._current(key) or 0) + 1
+            self._data[key] = (float('inf'), str(value).encode())
+            return value
+
+    def set_if_equal(self, guard_key, expected, key, value, ttl):
+        with self._lock:
+            if self._current(guard_key) != expected:
+                return False
+            self._data[key] = (self._clock() + ttl, value)
+            return True
+
+    def stats(self):
+        with self._lock:
+            return {'size': len(self._data), 'bytes': sum(len(value) for _, value in self._data.values())}
+
+
+class ResponseCache:
+    """Respostas serializadas (bytes, com ETag e Last-Modified) por recurso e versão.
+
+    As entradas ficam em '<recurso>:<id>:<versão>:<variante>', em que a versão vem
+    das colunas updated_at e a variante distingue as query strings (ex.: fields=).
+    Uma entrada nunca muda depois de gravada: a de uma versão antiga só deixa de
+    ser lida e sai pelo LRU/TTL.
+
+    Sem SharedCache (só o LRU do worker), quem lê consulta a versão atual no banco
+    (uma leitura de índice) e busca a entrada dela com get(..., version=...): o
+    cache poupa a leitura completa e a serialização, e uma escrita feita em outro
+    worker vale na hora, sem depender de remoção.
+
+    Com um SharedCache, cada recurso ('service', 12) tem também um ponteiro para a
+    versão atual, e get() sem versão responde sem ir ao banco. Uma escrita apaga o
+    ponteiro (evict), o que invalida todas as variantes em todos os workers. Cada
+    recurso tem uma geração, que evict() incrementa: a leitura que vai ao banco
+    captura generation() antes da consulta e passa o valor a set(); se uma escrita
+    removeu o recurso nesse meio-tempo, o ponteiro não é gravado (compare-and-set)
+    e a versão antiga não volta. O LRU local guarda as entradas também nesse modo.
+    """
+
+    def __init__(self, local, shared=None):
+        self.local = local
+        self.shared = shared
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.stale_writes = 0
+
+    @staticmethod
+    def _pointer_key(resource, resource_id):
+        return f'{resource}:{resource_id}'
+
+    @staticmethod
+    def _generation_key(resource, resource_id):
+        return f'generation:{resource}:{resource_id}'
+
+    def _count(self, hit):
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def get(self, resource, resource_id, variant, version=None):
+        """(etag, last_modified, corpo) da versão pedida, ou None.
+
+        Sem 'version', segue o ponteiro da versão atual; só há ponteiros com um
+        SharedCache, então sem ele devolve None e o chamador lê a versão no banco.
+        """
+        pointer_key = self._pointer_key(resource, resource_id)
+        if version is None:
+            if self.shared is None:
+                return None
+            version = self.shared.get(pointer_key)
+            if version is None:
+                return None  # Não conta como erro: o chamador ainda busca pela versão
+            version = version.decode()
+        entry_key = f'{pointer_key}:{version}:{variant}'
+        entry = self.local.get(entry_key)
+        if entry is None and self.shared is not None:
+            entry = self.shared.get(entry_key)
+            if entry is not None:
+                self.local.set(entry_key, entry)
+        self._count(entry is not None)
+        return _decode_entry(entry) if entry is not None else None
+
+    def generation(self, resource, resource_id):
+        """Geração atual do recurso; capturar antes de ler o banco e repassar a set().
+
+        Sem SharedCache não há ponteiro a proteger e a geração é sempre None.
+        """
+        if self.shared is None:
+            return None
+        return self.shared.get(self._generation_key(resource, resource_id))
+
+    def set(self, resource, resource_id, generation, version, variant, etag, last_modified, body):
+        """Grava a resposta; False se o ponteiro foi descartado (recurso removido depois de 'generation')."""
+        pointer_key = self._pointer_key(resource, resource_id)
+        entry_key = f'{pointer_key}:{version}:{variant}'
+        entry = _encode_entry(etag, last_modified, body)
+        # A entrada é imutável (a versão está na chave); só o ponteiro é condicional
+        self.local.set(entry_key, entry)
+        if self.shared is None:
+            return True
+        self.shared.set(entry_key, entry, self.local.ttl)
+        stored = self.shared.set_if_equal(self._generation_key(resource, resource_id), generation,
+                                          pointer_key, version.encode(), self.local.ttl)
+        if not stored:
+            with self._lock:
+                self.stale_writes += 1
+        return stored
+
+    def evict(self, resource, resource_id):
+        """Descarta o ponteiro do recurso. Sem SharedCache não há o que remover."""
+        if self.shared is None:
+            return
+        # Incrementa antes de apagar: uma gravação concorrente já não passa no compare-and-set
+        self.shared.incr(self._generation_key(resource, resource_id))
+        self.shared.delete(self._pointer_key(resource, resource_id))
+
+    def stats(self):
+        """Acertos/erros por requisição e memória do LRU local (e do backend compartilhado)."""
+        total = self.hits + self.misses
+        stats = {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hitRatio': round(self.hits / total, 4) if total else None,
+            'local': {key: value for key, value in self.local.stats().items() if key in ('size', 'maxsize', 'bytes')},
+        }
+        if self.shared is not None:
+            stats['staleWritesDropped'] = self.stale_writes
+            stats['shared'] = self.shared.stats()
+        return stats
+
+
+def _encode_entry(etag, last_modified, body):
+    header = f"{etag}\n{last_modified.isoformat() if last_modified else ''}\n"
+    return header.encode() + body
+
+def _decode_entry(entry):
+    etag, last_modified, body = entry.split(b'\n', 2)
+    return etag.decode(), datetime.fromisoformat(last_modified.decode()) if last_modified else None, body
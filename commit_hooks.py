@@ -0,0 +1,129 @@
+# commit_hooks.py
+# Alterações de cada transação, coletadas uma única vez por flush e entregues
+# depois do commit a quem registrou um callback com on_commit() (índice de
+# trigramas, caches em memória, cache de respostas, feeds SSE). Quem reage já
+# encontra a alteração no banco, e uma transação desfeita não entrega nada.
+import logging
+
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+
+from models import User, Service
+
+SERVICE_CREATED = 'created'
+SERVICE_UPDATED = 'updated'
+SERVICE_DELETED = 'deleted'
+
+_INFO_KEY = 'transaction_changes'
+_callbacks = []
+
+logger = logging.getLogger(__name__)
+
+
+class UserChange:
+    """Usuário alterado: colunas que mudaram e, se o saldo mudou, o saldo final."""
+
+    __slots__ = ('deleted', 'attributes', 'time_chronos')
+
+    def __init__(self):
+        self.deleted = False
+        self.attributes = set()
+        self.time_chronos = None
+
+
+class TransactionChanges:
+    """O que uma transação alterou, acumulado entre os flushes dela.
+
+    - services: id -> SERVICE_CREATED, SERVICE_UPDATED ou SERVICE_DELETED; um
+      serviço criado e excluído na mesma transação não aparece.
+    - owner_services: ids dos serviços cujo dono mudou nome ou e-mail (o
+      userEntity das respostas de serviço), sem que o serviço em si mudasse.
+    - users: id -> UserChange.
+    - created_categories: nome normalizado -> (id, nome), registrado por quem
+      cria as categorias (INSERT direto, fora do flush).
+    """
+
+    def __init__(self):
+        self.services = {}
+        self.owner_services = set()
+        self.users = {}
+        self.created_categories = {}
+
+    def __bool__(self):
+        return bool(self.services or self.owner_services or self.users or self.created_categories)
+
+    def _service(self, service_id, change):
+        previous = self.services.get(service_id)
+        if previous == SERVICE_CREATED and change == SERVICE_DELETED:
+            # Criado e excluído na mesma transação: ninguém chegou a vê-lo
+            del self.services[service_id]
+        elif previous != SERVICE_CREATED:
+            self.services[service_id] = change
+
+    def _user(self, user_id):
+        change = self.users.get(user_id)
+        if change is None:
+            change = self.users[user_id] = UserChange()
+        return change
+
+
+def on_commit(callback):
+    """Registra callback(changes), chamado após cada commit que alterou algo. Serve de decorador."""
+    _callbacks.append(callback)
+    return callback
+
+def pending_changes(session):
+    """Alterações ainda não confirmadas da transação de 'session'."""
+    changes = session.info.get(_INFO_KEY)
+    if changes is None:
+        changes = session.info[_INFO_KEY] = TransactionChanges()
+    return changes
+
+
+def _changed_columns(obj):
+    state = inspect(obj)
+    return {key for key in state.mapper.column_attrs.keys() if state.attrs[key].history.has_changes()}
+
+@event.listens_for(Session, 'after_flush')
+def _collect_changes(session, flush_context):
+    # Em after_flush, new/dirty/deleted e o histórico dos atributos ainda são os de antes do flush
+    for obj in session.new:
+        if isinstance(obj, Service):
+            pending_changes(session)._service(obj.id, SERVICE_CREATED)
+    for obj in session.dirty:
+        if isinstance(obj, Service):
+            if session.is_modified(obj):
+                pending_changes(session)._service(obj.id, SERVICE_UPDATED)
+        elif isinstance(obj, User) and session.is_modified(obj, include_collections=False):
+            changes = pending_changes(session)
+            user_change = changes._user(obj.id)
+            attributes = _changed_columns(obj)
+            user_change.attributes |= attributes
+            if 'time_chronos' in attributes:
+                user_change.time_chronos = obj.time_chronos
+            if 'name' in attributes or 'email' in attributes:
+                owned = session.connection().execute(select(Service.id).where(Service.user_id == obj.id))
+                changes.owner_services.update(owned.scalars())
+    for obj in session.deleted:
+        if isinstance(obj, Service):
+            pending_changes(session)._service(obj.id, SERVICE_DELETED)
+        elif isinstance(obj, User):
+            pending_changes(session)._user(obj.id).deleted = True
+
+@event.listens_for(Session, 'after_commit')
+def _run_callbacks(session):
+    changes = session.info.pop(_INFO_KEY, None)
+    if not changes:
+        return
+    for callback in _callbacks:
+        # Os dados já estão confirmados: a falha de um efeito colateral (ex.: backend
+        # do cache fora do ar) não pode escapar de commit(), virar um 500 para uma
+        # escrita que deu certo nem impedir os demais callbacks
+        try:
+            callback(changes)
+        except Exception:
+            logger.exception('Falha no callback pós-commit %s', getattr(callback, '__qualname__', callback))
+
+@event.listens_for(Session, 'after_soft_rollback')
+def _discard_changes(session, previous_transaction):
+    session.info.pop(_INFO_KEY, None)
@@ -0,0 +1,149 @@
+# events.py
+# Publicação/assinatura (pub/sub) dos feeds de eventos (SSE). As rotas só conhecem
+# a interface Broker; LocalBroker entrega em memória, dentro do processo (um por
+# worker), e também serve de dublê em testes. Com vários workers, os eventos de um
+# não chegam aos assinantes dos outros: basta registrar com set_broker() uma
+# implementação de Broker sobre um backend compartilhado (ex.: Redis pub/sub).
+import threading
+from abc import ABC, abstractmethod
+from collections import deque
+
+from commit_hooks import on_commit
+
+# Eventos pendentes por assinante; ao encher, o mais antigo é descartado
+SUBSCRIBER_QUEUE_SIZE = 100
+
+SERVICES_CHANNEL = 'services'
+
+def user_channel(user_id):
+    """Canal privado de um usuário (saldo de Chronos)."""
+    return f'user:{user_id}'
+
+
+class Subscription:
+    """Fila limitada de um assinante.
+
+    Um assinante lento não segura quem publica nem acumula memória: ao passar de
+    'maxsize' eventos, o mais antigo é descartado e contado em 'dropped', para que
+    o cliente saiba que precisa se ressincronizar.
+    """
+
+    def __init__(self, broker, channel, maxsize):
+        self.broker = broker
+        self.channel = channel
+        self.dropped = 0
+        self._queue = deque(maxlen=maxsize)
+        self._ready = threading.Condition()
+
+    def put(self, item):
+        with self._ready:
+            if len(self._queue) == self._queue.maxlen:
+                self.dropped += 1
+            self._queue.append(item)
+            self._ready.notify()
+
+    def get(self, timeout):
+        """Retira os eventos pendentes e quantos foram descartados desde a última leitura.
+
+        Espera até 'timeout' segundos; sem eventos nesse tempo, devolve lista vazia.
+        """
+        with self._ready:
+            if not self._queue:
+                self._ready.wait(timeout)
+            items = list(self._queue)
+            self._queue.clear()
+            dropped, self.dropped = self.dropped, 0
+        return items, dropped
+
+    def close(self):
+        self.broker.unsubscribe(self)
+
+
+class Broker(ABC):
+    """Interface do pub/sub usada pelas rotas.
+
+    Uma implementação que não define todos os métodos abstratos falha ao ser
+    instanciada, e não na primeira publicação.
+    """
+
+    @abstractmethod
+    def publish(self, channel, item):
+        """Entrega 'item' (par nome do evento, dados) a todos os assinantes do canal."""
+
+    @abstractmethod
+    def subscribe(self, channel, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        """Devolve uma Subscription do canal; o chamador deve fechá-la com close()."""
+
+    @abstractmethod
+    def unsubscribe(self, subscription):
+        """Remove a assinatura; chamado por Subscription.close()."""
+
+    def stats(self):
+        return {}
+
+
+class LocalBroker(Broker):
+    """Broker em memória do processo: cada publicação é copiada para a fila de cada assinante."""
+
+    def __init__(self):
+        self._channels = {}  # canal -> conjunto de Subscription
+        self._lock = threading.Lock()
+
+    def publish(self, channel, item):
+        with self._lock:
+            subscribers = tuple(self._channels.get(channel, ()))
+        for subscription in subscribers:
+            subscription.put(item)
+
+    def subscribe(self, channel, maxsize=SUBSCRIBER_QUEUE_SIZE):
+        subscription = Subscription(self, channel, maxsize)
+        with self._lock:
+            self._channels.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._channels.get(subscription.channel)
+            if subscribers is not None:
+                subscribers.discard(subscription)
+                if not subscribers:
+                    del self._channels[subscription.channel]
+
+    def stats(self):
+        with self._lock:
+            return {
+                'channels': len(self._channels),
+                'subscribers': sum(len(subscribers) for subscribers in self._channels.values()),
+            }
+
+
+_broker = LocalBroker()
+
+def get_broker():
+    return _broker
+
+def set_broker(broker):
+    """Troca o broker do processo (backend compartilhado em produção, dublê em testes)."""
+    global _broker
+    _broker = broker
+
+def publish(channel, item):
+    _broker.publish(channel, item)
+
+def subscribe(channel, maxsize=SUBSCRIBER_QUEUE_SIZE):
+    return _broker.subscribe(channel, maxsize)
+
+
+# --- Eventos de serviços e de saldo ---
+# Publicados só depois do commit (ver commit_hooks): quem recebe o evento já
+# encontra a alteração no banco, e uma transação desfeita não publica nada.
+@on_commit
+def _publish_events(changes):
+    for service_id, change in changes.services.items():
+        publish(SERVICES_CHANNEL, ('service', {'type': change, 'id': service_id}))
+    # Qualquer alteração de time_chronos (compra, venda, transferências) publica o
+    # saldo final, não a diferença: repetir ou perder um evento intermediário não
+    # deixa o cliente com valor errado
+    for user_id, user_change in changes.users.items():
+        if 'time_chronos' in user_change.attributes and not user_change.deleted:
+            publish(user_channel(user_id), ('balance', {'timeChronos': user_change.time_chronos}))
@@ -0,0 +1,107 @@
+"""normalized (accent-folded, stemmed) search columns
+
+Revision ID: 1bcda27e2f33
+Revises: 472192b3f968
+Create Date: 2026-10-18 13:02:41.275390
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from normalization import fold, normalize_for_search
+
+
+revision = '1bcda27e2f33'
+down_revision = '472192b3f968'
+branch_labels = None
+depends_on = None
+
+
+services = sa.table('services',
+    sa.column('id', sa.Integer),
+    sa.column('title', sa.String),
+    sa.column('description', sa.Text),
+    sa.column('search_title', sa.Text),
+    sa.column('search_body', sa.Text),
+)
+categories = sa.table('categories',
+    sa.column('id', sa.Integer),
+    sa.column('name', sa.String),
+    sa.column('normalized_name', sa.String),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('search_title', sa.Text(), nullable=True))
+        batch_op.add_column(sa.Column('search_body', sa.Text(), nullable=True))
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('normalized_name', sa.String(length=255), nullable=True))
+
+    # Preenche as colunas normalizadas com a mesma função usada na escrita
+    for row in bind.execute(sa.select(services.c.id, services.c.title, services.c.description)).fetchall():
+        bind.execute(services.update().where(services.c.id == row.id).values(
+            search_title=normalize_for_search(row.title),
+            search_body=normalize_for_search(row.description),
+        ))
+    for row in bind.execute(sa.select(categories.c.id, categories.c.name)).fetchall():
+        bind.execute(categories.update().where(categories.c.id == row.id).values(
+            normalized_name=fold(row.name),
+        ))
+
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.alter_column('search_title', existing_type=sa.Text(), nullable=False)
+        batch_op.alter_column('search_body', existing_type=sa.Text(), nullable=False)
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.alter_column('normalized_name', existing_type=sa.String(length=255), nullable=False)
+        batch_op.create_index(batch_op.f('ix_categories_normalized_name'), ['normalized_name'], unique=False)
+
+    # O índice de busca passa a usar o texto normalizado
+    if bind.dialect.name == 'sqlite':
+        op.execute("DELETE FROM services_fts")
+        op.execute(
+            "INSERT INTO services_fts (rowid, title, description) "
+            "SELECT id, search_title, search_body FROM services"
+        )
+    elif bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_services_search_vector")
+        op.execute("ALTER TABLE services DROP COLUMN search_vector")
+        op.execute(
+            "ALTER TABLE services ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('simple', search_title), 'A') || "
+            "setweight(to_tsvector('simple', search_body), 'B')"
+            ") STORED"
+        )
+        op.execute("CREATE INDEX ix_services_search_vector ON services USING gin (search_vector)")
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name == 'sqlite':
+        op.execute("DELETE FROM services_fts")
+        op.execute(
+            "INSERT INTO services_fts (rowid, title, description) "
+            "SELECT id, title, description FROM services"
+        )
+    elif bind.dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_services_search_vector")
+        op.execute("ALTER TABLE services DROP COLUMN search_vector")
+        op.execute(
+            "ALTER TABLE services ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('portuguese', coalesce(description, '')), 'B')"
+            ") STORED"
+        )
+        op.execute("CREATE INDEX ix_services_search_vector ON services USING gin (search_vector)")
+
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_categories_normalized_name'))
+        batch_op.drop_column('normalized_name')
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.drop_column('search_body')
+        batch_op.drop_column('search_title')
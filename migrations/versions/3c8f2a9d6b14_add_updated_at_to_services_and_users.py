@@ -0,0 +1,45 @@
+"""add updated_at to services and users
+
+Revision ID: 3c8f2a9d6b14
+Revises: b5d1e93c07fa
+Create Date: 2026-10-18 16:48:31.902215
+
+"""
+from datetime import datetime, timezone
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '3c8f2a9d6b14'
+down_revision = 'b5d1e93c07fa'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Coluna anulável, preenchida com o momento da migração e só então NOT NULL
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('updated_at', sa.DateTime(), nullable=True))
+
+    now = datetime.now(timezone.utc).replace(tzinfo=None)
+    bind = op.get_bind()
+    for table_name in ('services', 'users'):
+        table = sa.table(table_name, sa.column('updated_at', sa.DateTime()))
+        bind.execute(table.update().values(updated_at=now))
+
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+        batch_op.create_index(batch_op.f('ix_services_updated_at'), ['updated_at'], unique=False)
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.alter_column('updated_at', existing_type=sa.DateTime(), nullable=False)
+
+
+def downgrade():
+    with op.batch_alter_table('users', schema=None) as batch_op:
+        batch_op.drop_column('updated_at')
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_services_updated_at'))
+        batch_op.drop_column('updated_at')
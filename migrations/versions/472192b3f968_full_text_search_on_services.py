@@ -0,0 +1,49 @@
+"""full-text search on services (FTS5 / tsvector)
+
+Revision ID: 472192b3f968
+Revises: d2e38d4b526a
+Create Date: 2026-10-18 11:27:15.660841
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '472192b3f968'
+down_revision = 'd2e38d4b526a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        # Mantida em sincronia pelos eventos de mapper em search.py
+        op.execute(
+            "CREATE VIRTUAL TABLE IF NOT EXISTS services_fts "
+            "USING fts5(title, description, tokenize = 'unicode61 remove_diacritics 2')"
+        )
+        op.execute(
+            "INSERT INTO services_fts (rowid, title, description) "
+            "SELECT id, title, description FROM services"
+        )
+    elif dialect == 'postgresql':
+        # Coluna gerada: o próprio Postgres a atualiza em toda escrita.
+        # Peso A para o título e B para a descrição (usado por ts_rank).
+        op.execute(
+            "ALTER TABLE services ADD COLUMN search_vector tsvector "
+            "GENERATED ALWAYS AS ("
+            "setweight(to_tsvector('portuguese', coalesce(title, '')), 'A') || "
+            "setweight(to_tsvector('portuguese', coalesce(description, '')), 'B')"
+            ") STORED"
+        )
+        op.execute("CREATE INDEX ix_services_search_vector ON services USING gin (search_vector)")
+
+
+def downgrade():
+    dialect = op.get_bind().dialect.name
+    if dialect == 'sqlite':
+        op.execute("DROP TABLE IF EXISTS services_fts")
+    elif dialect == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_services_search_vector")
+        op.execute("ALTER TABLE services DROP COLUMN IF EXISTS search_vector")
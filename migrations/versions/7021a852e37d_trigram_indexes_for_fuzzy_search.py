@@ -0,0 +1,31 @@
+"""trigram indexes for fuzzy search (pg_trgm)
+
+Revision ID: 7021a852e37d
+Revises: 1bcda27e2f33
+Create Date: 2026-10-18 14:10:58.302614
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '7021a852e37d'
+down_revision = '1bcda27e2f33'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # No SQLite o índice de trigramas fica em memória (search.TrigramIndex)
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.execute("CREATE INDEX ix_services_search_title_trgm ON services USING gin (search_title gin_trgm_ops)")
+    op.execute("CREATE INDEX ix_categories_normalized_name_trgm ON categories USING gin (normalized_name gin_trgm_ops)")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_categories_normalized_name_trgm")
+    op.execute("DROP INDEX IF EXISTS ix_services_search_title_trgm")
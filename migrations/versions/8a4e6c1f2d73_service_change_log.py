@@ -0,0 +1,41 @@
+"""service change log for incremental sync
+
+Revision ID: 8a4e6c1f2d73
+Revises: 3c8f2a9d6b14
+Create Date: 2026-10-18 17:20:44.561078
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '8a4e6c1f2d73'
+down_revision = '3c8f2a9d6b14'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    service_changes = op.create_table('service_changes',
+        sa.Column('seq', sa.Integer(), nullable=False),
+        sa.Column('service_id', sa.Integer(), nullable=False),
+        sa.Column('op', sa.String(length=10), nullable=False),
+        sa.PrimaryKeyConstraint('seq'),
+        sqlite_autoincrement=True
+    )
+    with op.batch_alter_table('service_changes', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_service_changes_service_id'), ['service_id'], unique=True)
+
+    # Serviços existentes entram no registro, para que since=0 devolva o catálogo inteiro
+    services = sa.table('services', sa.column('id', sa.Integer()))
+    op.get_bind().execute(service_changes.insert().from_select(
+        ['service_id', 'op'],
+        sa.select(services.c.id, sa.literal('upsert')).order_by(services.c.id)
+    ))
+
+
+def downgrade():
+    with op.batch_alter_table('service_changes', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_service_changes_service_id'))
+
+    op.drop_table('service_changes')
@@ -0,0 +1,65 @@
+"""unique normalized category name
+
+Revision ID: 90aa3fec132a
+Revises: 7021a852e37d
+Create Date: 2026-10-18 15:05:19.774032
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = '90aa3fec132a'
+down_revision = '7021a852e37d'
+branch_labels = None
+depends_on = None
+
+
+categories = sa.table('categories',
+    sa.column('id', sa.Integer),
+    sa.column('normalized_name', sa.String),
+)
+service_categories = sa.table('service_categories',
+    sa.column('service_id', sa.Integer),
+    sa.column('category_id', sa.Integer),
+)
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    # Une categorias que só diferem por acentos/maiúsculas na de menor id
+    duplicated = bind.execute(
+        sa.select(categories.c.normalized_name)
+        .group_by(categories.c.normalized_name)
+        .having(sa.func.count() > 1)
+    ).scalars().all()
+    for normalized_name in duplicated:
+        ids = bind.execute(
+            sa.select(categories.c.id)
+            .where(categories.c.normalized_name == normalized_name)
+            .order_by(categories.c.id)
+        ).scalars().all()
+        keep, duplicates = ids[0], ids[1:]
+        # Um serviço pode estar ligado a várias duplicadas: insere cada par
+        # (serviço, keep) uma só vez e só se ainda não existir
+        already_linked = sa.select(service_categories.c.service_id).where(service_categories.c.category_id == keep)
+        bind.execute(service_categories.insert().from_select(
+            ['service_id', 'category_id'],
+            sa.select(service_categories.c.service_id, sa.literal(keep))
+            .where(service_categories.c.category_id.in_(duplicates),
+                   service_categories.c.service_id.not_in(already_linked))
+            .distinct(),
+        ))
+        bind.execute(service_categories.delete().where(service_categories.c.category_id.in_(duplicates)))
+        bind.execute(categories.delete().where(categories.c.id.in_(duplicates)))
+
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_categories_normalized_name'))
+        batch_op.create_index(batch_op.f('ix_categories_normalized_name'), ['normalized_name'], unique=True)
+
+
+def downgrade():
+    with op.batch_alter_table('categories', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_categories_normalized_name'))
+        batch_op.create_index(batch_op.f('ix_categories_normalized_name'), ['normalized_name'], unique=False)
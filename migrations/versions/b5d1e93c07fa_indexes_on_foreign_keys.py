@@ -0,0 +1,39 @@
+"""indexes on foreign keys
+
+Revision ID: b5d1e93c07fa
+Revises: 90aa3fec132a
+Create Date: 2026-10-18 14:12:08.318442
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'b5d1e93c07fa'
+down_revision = '90aa3fec132a'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (user_id, id) serve a busca pelo dono e a paginação por cursor dos seus serviços
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.create_index('ix_services_user_id_id', ['user_id', 'id'], unique=False)
+
+    # A PK (service_id, category_id) não serve a busca pelos serviços de uma categoria
+    with op.batch_alter_table('service_categories', schema=None) as batch_op:
+        batch_op.create_index('ix_service_categories_category_id_service_id', ['category_id', 'service_id'], unique=False)
+
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_documents_user_id'), ['user_id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('documents', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_documents_user_id'))
+
+    with op.batch_alter_table('service_categories', schema=None) as batch_op:
+        batch_op.drop_index('ix_service_categories_category_id_service_id')
+
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.drop_index('ix_services_user_id_id')
@@ -0,0 +1,29 @@
+"""add indexes on service filter columns
+
+Revision ID: cfc7203f9999
+Revises: e0434a708f33
+Create Date: 2026-10-18 10:03:27.540219
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'cfc7203f9999'
+down_revision = 'e0434a708f33'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.create_index(batch_op.f('ix_services_time_chronos'), ['time_chronos'], unique=False)
+        batch_op.create_index(batch_op.f('ix_services_deadline'), ['deadline'], unique=False)
+        batch_op.create_index(batch_op.f('ix_services_modality'), ['modality'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.drop_index(batch_op.f('ix_services_modality'))
+        batch_op.drop_index(batch_op.f('ix_services_deadline'))
+        batch_op.drop_index(batch_op.f('ix_services_time_chronos'))
@@ -0,0 +1,33 @@
+"""composite indexes for service sorting
+
+Revision ID: d2e38d4b526a
+Revises: cfc7203f9999
+Create Date: 2026-10-18 10:41:52.903117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'd2e38d4b526a'
+down_revision = 'cfc7203f9999'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # (coluna, id) cobre tanto o filtro por faixa quanto a ordenação paginada,
+    # então substitui os índices simples de time_chronos e deadline
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.drop_index('ix_services_time_chronos')
+        batch_op.drop_index('ix_services_deadline')
+        batch_op.create_index('ix_services_time_chronos_id', ['time_chronos', 'id'], unique=False)
+        batch_op.create_index('ix_services_deadline_id', ['deadline', 'id'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.drop_index('ix_services_deadline_id')
+        batch_op.drop_index('ix_services_time_chronos_id')
+        batch_op.create_index('ix_services_deadline', ['deadline'], unique=False)
+        batch_op.create_index('ix_services_time_chronos', ['time_chronos'], unique=False)
@@ -0,0 +1,45 @@
+"""add image_hash to services
+
+Revision ID: e0434a708f33
+Revises: 00adb1771f76
+Create Date: 2026-10-18 09:12:04.118532
+
+"""
+import hashlib
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = 'e0434a708f33'
+down_revision = '00adb1771f76'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('image_hash', sa.String(length=64), nullable=True))
+
+    # Preenche o hash das imagens já cadastradas
+    services = sa.table('services',
+        sa.column('id', sa.Integer),
+        sa.column('service_image', sa.LargeBinary),
+        sa.column('image_hash', sa.String),
+    )
+    bind = op.get_bind()
+    ids = [row.id for row in bind.execute(sa.select(services.c.id))]
+    for service_id in ids:
+        image = bind.execute(
+            sa.select(services.c.service_image).where(services.c.id == service_id)
+        ).scalar()
+        bind.execute(
+            services.update()
+            .where(services.c.id == service_id)
+            .values(image_hash=hashlib.sha256(image or b'').hexdigest())
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('services', schema=None) as batch_op:
+        batch_op.drop_column('image_hash')
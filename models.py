@@ -1,11 +1,18 @@
 # models.py
 from flask_sqlalchemy import SQLAlchemy
 from werkzeug.security import generate_password_hash, check_password_hash
-import base64
+import hashlib
+from datetime import datetime, timezone
+
+from normalization import fold, normalize_for_search
 
 # Criar db separadamente, sem importar de app
 db = SQLAlchemy()
 
+def utcnow():
+    """Data/hora atual em UTC, sem fuso (como é gravada nas colunas DateTime)."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
 # Modelo para Documento (um documento associado a um usuário)
 class Document(db.Model):
     __tablename__ = 'documents'
@@ -13,9 +20,10 @@ class Document(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), nullable=False) # Nome do arquivo
     type = db.Column(db.String(100), nullable=False) # Tipo MIME (ex: image/png)
-    data = db.Column(db.LargeBinary, nullable=False) # Dados binários do arquivo
+    # Dados binários do arquivo; adiado (deferred) para só ser lido por quem envia os bytes
+    data = db.deferred(db.Column(db.LargeBinary, nullable=False))
     # Chave estrangeira para o usuário proprietário do documento
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False, index=True)
 
     # Relacionamento com User (muitos Documentos pertencem a um User)
     user = db.relationship('User', back_populates='document')
@@ -35,6 +43,13 @@ class Category(db.Model):
 
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(255), unique=True, nullable=False) # Nome único da categoria
+    # Nome sem acentos e em minúsculas, único: "Manutenção" e "manutencao" são a mesma categoria
+    normalized_name = db.Column(db.String(255), nullable=False, unique=True, index=True)
+
+    @db.validates('name')
+    def _normalize_name(self, key, name):
+        self.normalized_name = fold(name)
+        return name
 
     # Relacionamento muitos-para-muitos com Service via tabela associativa
     # services = db.relationship('Service', secondary='service_categories', back_populates='categories')
@@ -42,7 +57,10 @@ class Category(db.Model):
 # Tabela associativa para relacionamento Service-Category
 service_categories = db.Table('service_categories',
     db.Column('service_id', db.Integer, db.ForeignKey('services.id'), primary_key=True),
-    db.Column('category_id', db.Integer, db.ForeignKey('categories.id'), primary_key=True)
+    db.Column('category_id', db.Integer, db.ForeignKey('categories.id'), primary_key=True),
+    # A chave primária (service_id, category_id) só atende a busca por serviço; este
+    # índice atende o caminho inverso (serviços de uma categoria)
+    db.Index('ix_service_categories_category_id_service_id', 'category_id', 'service_id')
 )
 
 # Modelo para Usuário
@@ -56,6 +74,8 @@ class User(db.Model):
     password_hash = db.Column(db.String(255), nullable=False)
     roles = db.Column(db.JSON, default=['user']) # Armazena como JSON
     time_chronos = db.Column(db.Integer, nullable=False, default=0)
+    # Versão da linha: muda a cada UPDATE (ETag/Last-Modified das leituras)
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow)
 
     # Relacionamento com Documento (um usuário tem um documento)
     # A chave estrangeira está em Document, não aqui em User.
@@ -74,8 +94,14 @@ class User(db.Model):
         """Verifica se a senha fornecida corresponde ao hash armazenado."""
         return check_password_hash(self.password_hash, password)
 
-    def to_dict(self, include_document=False):
-        """Converte o objeto User para um dicionário."""
+    def to_dict(self, include_document=False, fields=None):
+        """Converte o objeto User para um dicionário.
+
+        'fields' restringe as chaves às pedidas (ver USER_FIELDS); só os atributos
+        dessas chaves são lidos, então combina com user_read_options(fields).
+        """
+        if fields is not None:
+            return {field: USER_FIELDS[field][1](self) for field in fields}
         user_dict = {
             'id': self.id,
             'name': self.name,
@@ -92,29 +118,82 @@ class User(db.Model):
 # No modelo Service, descomente e ajuste o relacionamento:
 class Service(db.Model):
     __tablename__ = 'services'
+    # Índices compostos (coluna, id) servem filtros por faixa e a ordenação paginada
+    # por cursor (ver SERVICE_SORTS em routes.py) sem ordenar a tabela inteira
+    __table_args__ = (
+        db.Index('ix_services_time_chronos_id', 'time_chronos', 'id'),
+        db.Index('ix_services_deadline_id', 'deadline', 'id'),
+        # Serviços de um usuário, já na ordem do cursor
+        db.Index('ix_services_user_id_id', 'user_id', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     title = db.Column(db.String(255), nullable=False)
     description = db.Column(db.Text, nullable=False)
     time_chronos = db.Column(db.Integer, nullable=False)
-    service_image = db.Column(db.LargeBinary, nullable=False)
+    service_image = db.deferred(db.Column(db.LargeBinary, nullable=False))  # Só carregado pela rota de imagem
+    image_hash = db.Column(db.String(64), nullable=True)  # SHA-256 da imagem (ETag / versão da URL)
     deadline = db.Column(db.Date, nullable=True)
-    modality = db.Column(db.String(20), nullable=True)  # Presencial, Remoto, Híbrido
+    modality = db.Column(db.String(20), nullable=True, index=True)  # Presencial, Remoto, Híbrido
     user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
+    # Título e descrição normalizados (sem acentos, radicalizados) para o índice de busca
+    search_title = db.deferred(db.Column(db.Text, nullable=False))
+    search_body = db.deferred(db.Column(db.Text, nullable=False))
+    # Versão da linha: muda a cada UPDATE (ETag/Last-Modified das leituras). Mudanças só
+    # nas categorias não geram UPDATE em services; quem as faz chama touch().
+    updated_at = db.Column(db.DateTime, nullable=False, default=utcnow, onupdate=utcnow, index=True)
     user_entity = db.relationship('User', back_populates='services')
 
     # Relacionamento com Categorias (AGORA ATIVADO)
     categories = db.relationship('Category', secondary=service_categories, backref='services')
 
-    def to_dict(self):
-        image_base64 = base64.b64encode(self.service_image).decode('utf-8') if self.service_image else None
-        
+    @db.validates('title', 'description')
+    def _normalize_search_text(self, key, value):
+        if key == 'title':
+            self.search_title = normalize_for_search(value)
+        else:
+            self.search_body = normalize_for_search(value)
+        return value
+
+    def set_image(self, image_bytes):
+        """Armazena a imagem e atualiza o hash usado como ETag e versão da URL."""
+        self.service_image = image_bytes
+        self.image_hash = hashlib.sha256(image_bytes).hexdigest()
+
+    @property
+    def image_url(self):
+        """URL da imagem; o parâmetro 'v' muda quando a imagem muda, permitindo cache longo."""
+        if self.image_hash:
+            return f'/service/{self.id}/image?v={self.image_hash}'
+        return f'/service/{self.id}/image'
+
+    def touch(self):
+        """Marca o serviço como alterado (nova versão)."""
+        self.updated_at = utcnow()
+
+    @staticmethod
+    def detect_image_type(image_bytes):
+        """Identifica o tipo MIME da imagem pelos primeiros bytes."""
+        if image_bytes.startswith(b'\x89PNG\r\n\x1a\n'):
+            return 'image/png'
+        if image_bytes.startswith(b'\xff\xd8\xff'):
+            return 'image/jpeg'
+        if image_bytes[:6] in (b'GIF87a', b'GIF89a'):
+            return 'image/gif'
+        if image_bytes[:4] == b'RIFF' and image_bytes[8:12] == b'WEBP':
+            return 'image/webp'
+        return 'application/octet-stream'
+
+    def to_dict(self, fields=None):
+        """'fields' restringe as chaves às pedidas (ver SERVICE_FIELDS), lendo só os atributos delas."""
+        if fields is not None:
+            return {field: SERVICE_FIELDS[field][1](self) for field in fields}
         return {
             'id': self.id,
             'title': self.title,
             'description': self.description,
             'timeChronos': self.time_chronos,
-            'serviceImage': image_base64,
+            'serviceImageUrl': self.image_url,
             'deadline': self.deadline.isoformat() if self.deadline else None,
             'modality': self.modality,
             'userEntity': {
@@ -123,4 +202,87 @@ class Service(db.Model):
                 'email': self.user_entity.email
             },
             'categoryEntities': [{'id': cat.id, 'name': cat.name} for cat in self.categories]
-        }
\ No newline at end of file
+        }
+
+
+# Registro de alterações do catálogo, para sincronização incremental (/service/changes)
+class ServiceChange(db.Model):
+    """Última alteração de cada serviço, com número de sequência sempre crescente.
+
+    Compactado: cada serviço tem uma só linha, reescrita com novo 'seq' a cada
+    mudança. Exclusões ficam como 'delete' (tombstone). Sem chave estrangeira
+    para services, porque a linha sobrevive à exclusão do serviço.
+    """
+    __tablename__ = 'service_changes'
+    # AUTOINCREMENT no SQLite: sem ele o rowid de uma linha apagada no topo seria reutilizado
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    OP_UPSERT = 'upsert'
+    OP_DELETE = 'delete'
+
+    seq = db.Column(db.Integer, primary_key=True)
+    service_id = db.Column(db.Integer, nullable=False, unique=True, index=True)
+    op = db.Column(db.String(10), nullable=False)
+
+
+# Campos aceitos em ?fields= -> (colunas necessárias, serialização). Os nomes são
+# as chaves de to_dict(); userEntity e categoryEntities são os relacionamentos.
+USER_FIELDS = {
+    'id': (('id',), lambda user: user.id),
+    'name': (('name',), lambda user: user.name),
+    'email': (('email',), lambda user: user.email),
+    'phoneNumber': (('phone_number',), lambda user: user.phone_number),
+    'timeChronos': (('time_chronos',), lambda user: user.time_chronos),
+    'roles': (('roles',), lambda user: user.roles),
+}
+
+SERVICE_FIELDS = {
+    'id': (('id',), lambda service: service.id),
+    'title': (('title',), lambda service: service.title),
+    'description': (('description',), lambda service: service.description),
+    'timeChronos': (('time_chronos',), lambda service: service.time_chronos),
+    'serviceImageUrl': (('image_hash',), lambda service: service.image_url),
+    'deadline': (('deadline',), lambda service: service.deadline.isoformat() if service.deadline else None),
+    'modality': (('modality',), lambda service: service.modality),
+    'userEntity': (('user_id',), lambda service: {
+        'id': service.user_entity.id,
+        'name': service.user_entity.name,
+        'email': service.user_entity.email
+    }),
+    'categoryEntities': ((), lambda service: [{'id': cat.id, 'name': cat.name} for cat in service.categories]),
+}
+
+
+def _field_columns(model, field_map, fields, extra_columns=()):
+    names = {'id'}.union(*(field_map[field][0] for field in fields))
+    return [getattr(model, name) for name in sorted(names)] + list(extra_columns)
+
+
+def user_read_options(fields=None):
+    """Com 'fields', carrega só as colunas desses campos (load_only)."""
+    if fields is None:
+        return ()
+    return (db.load_only(*_field_columns(User, USER_FIELDS, fields)),)
+
+
+def service_read_options(fields=None, extra_columns=()):
+    """Opções de carregamento para toda leitura de Service que será serializada.
+
+    Evita o N+1 de to_dict(): o dono vem no mesmo SELECT (joinedload, só as
+    colunas usadas) e as categorias de todos os serviços em um único SELECT ... IN
+    (selectinload), independentemente da quantidade de serviços.
+
+    Com 'fields' (ver SERVICE_FIELDS), o SELECT traz só as colunas desses campos
+    e os relacionamentos não pedidos não são carregados. 'extra_columns' entra no
+    SELECT mesmo sem ser serializado (ex.: a coluna de ordenação do cursor).
+    """
+    user_options = db.joinedload(Service.user_entity).load_only(User.id, User.name, User.email)
+    if fields is None:
+        return (user_options, db.selectinload(Service.categories))
+
+    options = [db.load_only(*_field_columns(Service, SERVICE_FIELDS, fields, extra_columns))]
+    if 'userEntity' in fields:
+        options.append(user_options)
+    if 'categoryEntities' in fields:
+        options.append(db.selectinload(Service.categories))
+    return tuple(options)
@@ -0,0 +1,62 @@
+# normalization.py
+# Normalização de texto em português para busca: remoção de acentos, caixa baixa
+# e um radicalizador (stemmer) leve. Roda uma vez na escrita (colunas normalizadas
+# em models.py) e na consulta, para que os dois lados comparem a mesma forma.
+import re
+import unicodedata
+
+_WORD_RE = re.compile(r'\w+')
+
+# Sufixos retirados pelo radicalizador, já sem acentos e do mais longo para o mais
+# curto. É uma versão leve (plural, grau e sufixos derivacionais comuns): une
+# "manutenção"/"manutencoes" e "pintura"/"pintar", sem tentar ser um RSLP completo.
+_PLURAL_SUFFIXES = (
+    ('coes', 'cao'), ('oes', 'ao'), ('aes', 'ao'), ('ais', 'al'), ('eis', 'el'),
+    ('ois', 'ol'), ('uis', 'ul'), ('res', 'r'), ('zes', 'z'), ('ns', 'm'),
+)
+_DERIVATIONAL_SUFFIXES = (
+    'amentos', 'imentos', 'amento', 'imento', 'zinhas', 'zinhos', 'zinha', 'zinho',
+    'inhas', 'inhos', 'inha', 'inho', 'mente', 'idade', 'agem', 'ismo', 'ista',
+    'ador', 'edor', 'idor', 'cao', 'ura', 'ar', 'er', 'ir',
+)
+_FINAL_VOWELS = ('a', 'e', 'o')
+_MIN_STEM = 3
+
+
+def fold(text):
+    """Remove acentos, converte para minúsculas e normaliza espaços."""
+    if not text:
+        return ''
+    decomposed = unicodedata.normalize('NFKD', text)
+    without_marks = ''.join(ch for ch in decomposed if not unicodedata.combining(ch))
+    return ' '.join(without_marks.casefold().split())
+
+
+def stem(word):
+    """Reduz uma palavra já normalizada por fold() ao seu radical."""
+    for suffix, replacement in _PLURAL_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+            word = word[:-len(suffix)] + replacement
+            break
+    else:
+        if word.endswith('s') and not word.endswith('ss') and len(word) > _MIN_STEM + 1:
+            word = word[:-1]
+
+    for suffix in _DERIVATIONAL_SUFFIXES:
+        if word.endswith(suffix) and len(word) - len(suffix) >= _MIN_STEM:
+            word = word[:-len(suffix)]
+            break
+
+    if word.endswith(_FINAL_VOWELS) and len(word) > _MIN_STEM:
+        word = word[:-1]
+    return word
+
+
+def tokenize(text):
+    """Separa o texto normalizado em palavras."""
+    return _WORD_RE.findall(fold(text))
+
+
+def normalize_for_search(text):
+    """Forma indexada de um texto: palavras sem acento, radicalizadas, separadas por espaço."""
+    return ' '.join(stem(word) for word in tokenize(text))
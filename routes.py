@@ -1,18 +1,375 @@
 # routes.py
-from flask import Blueprint, request, jsonify
-from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from flask import Blueprint, Response, current_app, request, jsonify, make_response, stream_with_context
+from flask_jwt_extended import create_access_token, jwt_required, get_jwt, get_jwt_identity
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import make_transient_to_detached
+from werkzeug.http import is_resource_modified
 from werkzeug.security import generate_password_hash, check_password_hash
+from werkzeug.utils import import_string
 import base64
+import hashlib
+import json
 import re
+import time
 from datetime import date as dt_date
 
 # Importar db e modelos de models.py (NÃO de app.py)
-from models import db, User, Service, Category, Document
+from models import (db, User, Service, ServiceChange, Category, Document, service_categories, service_read_options,
+                    user_read_options, SERVICE_FIELDS, USER_FIELDS)
+from cache import TTLCache, ResponseCache, SharedCache
+from commit_hooks import on_commit, pending_changes, SERVICE_CREATED
+from normalization import fold, normalize_for_search
+from serialization import service_rows_query, service_dtos
+from sync import changes_since
+from events import subscribe, user_channel, SERVICES_CHANNEL
+from search import filter_by_text, fuzzy_search, category_suggester, DEFAULT_SIMILARITY_THRESHOLD
 
 # --- Blueprints ---
 auth_bp = Blueprint('auth', __name__, url_prefix='/auth')
 service_bp = Blueprint('service', __name__, url_prefix='/service')
 user_bp = Blueprint('user', __name__, url_prefix='/user')
+category_bp = Blueprint('category', __name__, url_prefix='/category')
+
+# --- Paginação por cursor (keyset) ---
+# O cursor carrega a chave da última linha entregue; a próxima página é buscada
+# com "WHERE chave > cursor", então páginas profundas custam o mesmo que a primeira
+# (sem OFFSET).
+DEFAULT_PAGE_SIZE = 20
+MAX_PAGE_SIZE = 100
+
+def _encode_cursor(values):
+    """Serializa a chave da última linha da página em um cursor opaco."""
+    raw = json.dumps(values, separators=(',', ':')).encode('utf-8')
+    return base64.urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+def _decode_cursor(cursor):
+    """Decodifica um cursor gerado por _encode_cursor. Lança ValueError se inválido."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        return json.loads(raw)
+    except (ValueError, TypeError):
+        raise ValueError("Parâmetro 'cursor' inválido.")
+
+def _parse_page_args():
+    """Lê 'limit' e 'cursor' da query string. Lança ValueError se inválidos."""
+    limit_str = request.args.get('limit')
+    if limit_str is None or limit_str == '':
+        limit = DEFAULT_PAGE_SIZE
+    else:
+        try:
+            limit = int(limit_str)
+        except ValueError:
+            raise ValueError("Parâmetro 'limit' inválido.")
+        if limit <= 0:
+            raise ValueError("Parâmetro 'limit' inválido.")
+    limit = min(limit, MAX_PAGE_SIZE)
+
+    cursor = request.args.get('cursor')
+    return limit, (_decode_cursor(cursor) if cursor else None)
+
+# --- Filtros de listagem ---
+# Inteiros vindos do cliente são comparados com colunas de 64 bits; fora dessa
+# faixa o driver falharia (OverflowError) em vez de a rota responder 400
+MIN_INT64 = -2 ** 63
+MAX_INT64 = 2 ** 63 - 1
+
+def _is_int64(value):
+    """Inteiro (não booleano) que cabe em 64 bits com sinal."""
+    return isinstance(value, int) and not isinstance(value, bool) and MIN_INT64 <= value <= MAX_INT64
+
+def _parse_int_arg(name, default=None):
+    """Inteiro da query string; 'default' quando ausente (0 é um valor, não ausência)."""
+    value = request.args.get(name)
+    if value is None or value == '':
+        return default
+    try:
+        number = int(value)
+    except ValueError:
+        raise ValueError(f"Parâmetro '{name}' inválido.")
+    if not _is_int64(number):
+        raise ValueError(f"Parâmetro '{name}' inválido.")
+    return number
+
+def _parse_date_arg(name):
+    value = request.args.get(name)
+    if value is None or value == '':
+        return None
+    try:
+        return dt_date.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"Parâmetro '{name}' inválido. Use o formato AAAA-MM-DD.")
+
+def _parse_fields_arg(allowed):
+    """Lê 'fields' (campos separados por vírgula). None quando ausente (resposta completa)."""
+    value = request.args.get('fields', '').strip()
+    if not value:
+        return None
+    fields = list(dict.fromkeys(field.strip() for field in value.split(',') if field.strip()))
+    unknown = [field for field in fields if field not in allowed]
+    if unknown or not fields:
+        raise ValueError(f"Parâmetro 'fields' inválido. Use um ou mais de: {', '.join(allowed)}.")
+    return fields
+
+def _read_service_filters():
+    """Lê e valida os filtros da query string. Lança ValueError se inválidos.
+
+    Filtros aceitos: category (nome exato, sem diferenciar acentos e maiúsculas), min_chronos,
+    max_chronos, modality, deadline_after e deadline_before (datas inclusivas).
+    """
+    return {
+        'category': fold(request.args.get('category', '')),
+        'min_chronos': _parse_int_arg('min_chronos'),
+        'max_chronos': _parse_int_arg('max_chronos'),
+        'modality': request.args.get('modality', '').strip(),
+        'deadline_after': _parse_date_arg('deadline_after'),
+        'deadline_before': _parse_date_arg('deadline_before'),
+    }
+
+def _apply_service_filters(query, filters=None, skip=()):
+    """Aplica à consulta os filtros da query string (ou 'filters' já lidos).
+
+    'skip' lista filtros a ignorar ('category', 'chronos', 'modality'), usado pelas facetas.
+    """
+    if filters is None:
+        filters = _read_service_filters()
+
+    if filters['category'] and 'category' not in skip:
+        # Ids dos serviços da categoria via tabela associativa (sem varrer services)
+        category_service_ids = (
+            db.select(service_categories.c.service_id)
+            .join(Category, Category.id == service_categories.c.category_id)
+            .where(Category.normalized_name == filters['category'])
+        )
+        query = query.filter(Service.id.in_(category_service_ids))
+    if 'chronos' not in skip:
+        if filters['min_chronos'] is not None:
+            query = query.filter(Service.time_chronos >= filters['min_chronos'])
+        if filters['max_chronos'] is not None:
+            query = query.filter(Service.time_chronos <= filters['max_chronos'])
+    if filters['modality'] and 'modality' not in skip:
+        query = query.filter(Service.modality == filters['modality'])
+    if filters['deadline_after'] is not None:
+        query = query.filter(Service.deadline >= filters['deadline_after'])
+    if filters['deadline_before'] is not None:
+        query = query.filter(Service.deadline <= filters['deadline_before'])
+    return query
+
+# --- Ordenação da listagem ---
+# sort -> (coluna, decrescente). Cada coluna tem índice composto (coluna, id), então
+# a ordenação paginada é uma leitura de índice; o id desempata e entra no cursor.
+# None ordena só pelo id (padrão: ordem de criação).
+SERVICE_SORTS = {
+    'chronos_asc': (Service.time_chronos, False),
+    'chronos_desc': (Service.time_chronos, True),
+    'deadline_asc': (Service.deadline, False),
+    'deadline_desc': (Service.deadline, True),
+    'newest': (None, True),
+}
+
+def _parse_sort_arg():
+    sort = request.args.get('sort', '').strip() or None
+    if sort is not None and sort not in SERVICE_SORTS:
+        raise ValueError(f"Parâmetro 'sort' inválido. Use um de: {', '.join(SERVICE_SORTS)}.")
+    return sort
+
+def _sort_columns(sort):
+    """Coluna de ordenação de 'sort', que o cursor lê mesmo fora de 'fields'."""
+    column = SERVICE_SORTS.get(sort, (None, False))[0]
+    return (column,) if column is not None else ()
+
+def _order_services(query, sort):
+    """Ordena a consulta completa (sem paginação); valores nulos vão para o fim."""
+    column, descending = SERVICE_SORTS.get(sort, (None, False))
+    if column is None:
+        return query.order_by(Service.id.desc() if descending else Service.id)
+    if descending:
+        return query.order_by(column.is_(None), column.desc(), Service.id.desc())
+    return query.order_by(column.is_(None), column, Service.id)
+
+def _cursor_value(column, value):
+    """Converte o valor de ordenação do cursor de volta para o tipo da coluna."""
+    if value is None:
+        return None
+    if column.type.python_type is dt_date:
+        return dt_date.fromisoformat(value)
+    # bool é subclasse de int; inteiros acima de 64 bits estourariam no driver
+    if not _is_int64(value):
+        raise ValueError("Parâmetro 'cursor' inválido.")
+    return value
+
+def _paginate_services(query, limit, cursor, sort=None):
+    """Aplica a paginação keyset na ordenação 'sort' e retorna (serviços, próximo cursor).
+
+    O cursor é [sort, valor, id] da última linha entregue. Linhas com valor nulo
+    (ex.: serviços sem prazo) vêm depois de todas as outras, em uma segunda fase
+    com valor None no cursor, para que as duas fases usem o índice (coluna, id).
+    """
+    column, descending = SERVICE_SORTS.get(sort, (None, False))
+    after_value = after_id = None
+    if cursor is not None:
+        try:
+            cursor_sort, after_value, after_id = cursor
+            if cursor_sort != sort or not _is_int64(after_id):
+                raise ValueError()
+            after_value = _cursor_value(column, after_value) if column is not None else None
+        except (ValueError, TypeError):
+            raise ValueError("Parâmetro 'cursor' inválido.")
+
+    def id_after(last_id):
+        return Service.id < last_id if descending else Service.id > last_id
+
+    id_order = Service.id.desc() if descending else Service.id
+
+    # Busca uma linha a mais só para saber se existe próxima página
+    services = []
+    if column is None:
+        page = query
+        if after_id is not None:
+            page = page.filter(id_after(after_id))
+        services = page.order_by(id_order).limit(limit + 1).all()
+    else:
+        in_null_phase = cursor is not None and after_value is None
+        if not in_null_phase:
+            page = query.filter(column.isnot(None))
+            if after_id is not None:
+                value_after = column < after_value if descending else column > after_value
+                # O limite redundante (>= / <=) vira a faixa do índice (coluna, id); só com
+                # o OR, o SQLite percorre o índice desde o início a cada página
+                value_bound = column <= after_value if descending else column >= after_value
+                page = page.filter(value_bound, db.or_(value_after, db.and_(column == after_value, id_after(after_id))))
+            services = page.order_by(column.desc() if descending else column, id_order).limit(limit + 1).all()
+        if len(services) <= limit and column.nullable:
+            page = query.filter(column.is_(None))
+            if in_null_phase:
+                page = page.filter(id_after(after_id))
+            services += page.order_by(id_order).limit(limit + 1 - len(services)).all()
+
+    next_cursor = None
+    if len(services) > limit:
+        services = services[:limit]
+        last = services[-1]
+        last_value = getattr(last, column.key) if column is not None else None
+        if isinstance(last_value, dt_date):
+            last_value = last_value.isoformat()
+        next_cursor = _encode_cursor([sort, last_value, last.id])
+    return services, next_cursor
+
+# --- Leituras condicionais (ETag / Last-Modified) ---
+# O ETag vem das colunas updated_at (e da query string, que muda o corpo), então o
+# 304 sai sem carregar nem serializar o recurso.
+def _version_etag(*parts):
+    args = sorted(request.args.items(multi=True))
+    key = '|'.join(str(part) for part in parts) + '|' + repr(args)
+    return hashlib.sha1(key.encode()).hexdigest()[:24]
+
+def _with_validators(response, etag, last_modified=None):
+    response.set_etag(etag)
+    if last_modified is not None:
+        response.last_modified = last_modified
+    # O navegador guarda, mas revalida a cada uso
+    response.cache_control.no_cache = True
+    return response
+
+def _not_modified(etag, last_modified=None):
+    """Resposta 304 se o cliente já tem esta versão (If-None-Match / If-Modified-Since); senão None."""
+    if is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+        return None
+    return _with_validators(make_response('', 304), etag, last_modified)
+
+def _collection_etag(query, fields=None):
+    """ETag da listagem completa: quantidade e maiores updated_at do conjunto filtrado ('query').
+
+    A quantidade cobre exclusões; com userEntity na resposta, entra também o maior
+    updated_at dos donos (nome e e-mail vêm no corpo). Listagens não enviam
+    Last-Modified, porque uma exclusão não aumenta a data máxima e o
+    If-Modified-Since responderia 304.
+    """
+    columns = [db.func.count(Service.id), db.func.max(Service.updated_at)]
+    query = query.order_by(None)
+    if fields is None or 'userEntity' in fields:
+        query = query.join(User, User.id == Service.user_id)
+        columns.append(db.func.max(User.updated_at))
+    return _version_etag('services', *query.with_entities(*columns).one())
+
+def _page_etag(rows, next_cursor):
+    """ETag de uma página: ids e updated_at (serviço e dono) das linhas entregues.
+
+    Sai da própria página, sem percorrer o conjunto filtrado inteiro; as linhas
+    vêm de service_rows_query(..., with_versions=True).
+    """
+    versions = [(row.id, row.service_version, getattr(row, 'owner_version', None)) for row in rows]
+    return _version_etag('services-page', next_cursor, versions)
+
+# --- Cache de respostas ---
+# Corpo já serializado das leituras públicas por id (/service/get/<id>,
+# /user/get/<id> e /user/get), por recurso e versão (ver cache.ResponseCache).
+# Só com o LRU de cada worker, a versão atual (updated_at) é sempre lida do banco
+# e o cache poupa a leitura completa e a serialização: uma escrita feita em outro
+# worker vale na hora. Com RESPONSE_CACHE_BACKEND, um acerto responde sem ir ao
+# banco, inclusive o 304; as escritas removem só os recursos alterados, depois do
+# commit, e a geração capturada antes da leitura no banco impede que uma leitura
+# concorrente com a escrita regrave a versão anterior.
+RESPONSE_CACHE_SIZE = 5000
+RESPONSE_CACHE_TTL = 5 * 60
+response_cache = ResponseCache(TTLCache(maxsize=RESPONSE_CACHE_SIZE, ttl=RESPONSE_CACHE_TTL, sizeof=len))
+
+def configure_response_cache(backend):
+    """Liga o backend compartilhado entre workers (cache.SharedCache) do cache de respostas.
+
+    'backend' vem da configuração RESPONSE_CACHE_BACKEND: um SharedCache, uma
+    fábrica que o devolve ou o caminho de importação dela ('modulo:fabrica', ex.:
+    'cache:LocalSharedCache'). None mantém só o LRU local de cada worker.
+    """
+    if backend is None:
+        return
+    if isinstance(backend, str):
+        backend = import_string(backend)
+    shared = backend if isinstance(backend, SharedCache) else backend()
+    if not isinstance(shared, SharedCache):
+        raise TypeError(f"RESPONSE_CACHE_BACKEND deve produzir um SharedCache, não {type(shared).__name__}.")
+    response_cache.shared = shared
+
+def _response_variant():
+    return repr(sorted(request.args.items(multi=True)))
+
+def _version_key(versions):
+    return ','.join(str(value) for value in versions)
+
+def _cached_response(resource, resource_id, versions=None):
+    """Resposta (ou 304) vinda do cache de respostas; None se não houver entrada.
+
+    Sem 'versions', só acerta com backend compartilhado (ponteiro da versão atual);
+    com 'versions' (lidas do banco), busca a entrada dessa versão.
+    """
+    version = _version_key(versions) if versions is not None else None
+    entry = response_cache.get(resource, resource_id, _response_variant(), version)
+    if entry is None:
+        return None
+    etag, last_modified, body = entry
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified:
+        return not_modified
+    response = current_app.response_class(body, mimetype='application/json')
+    return _with_validators(response, etag, last_modified)
+
+def _cache_response(resource, resource_id, generation, versions, response, etag, last_modified):
+    response_cache.set(resource, resource_id, generation, _version_key(versions), _response_variant(), etag,
+                       last_modified, response.get_data())
+    return response
+
+@on_commit
+def _evict_stale_responses(changes):
+    # Serviços criados ainda não estão no cache; o userEntity das respostas de
+    # serviço traz nome e e-mail do dono (owner_services)
+    for service_id, change in changes.services.items():
+        if change != SERVICE_CREATED:
+            response_cache.evict('service', service_id)
+    for service_id in changes.owner_services:
+        response_cache.evict('service', service_id)
+    for user_id in changes.users:
+        response_cache.evict('user', user_id)
 
 # --- Rotas de Autenticação ---
 @auth_bp.route('/register', methods=['POST'])
@@ -85,6 +442,89 @@ def login():
 def logout():
     return jsonify({"message": "Logout realizado com sucesso."}), 200
 
+# --- Categorias ---
+# Cache nome normalizado -> (id, nome) das categorias, por worker. Categorias nunca
+# são apagadas nem renomeadas, então uma entrada só fica desatualizada se sumir do
+# banco; o TTL limita esse caso e o limite de itens limita a memória.
+CATEGORY_CACHE_SIZE = 5000
+CATEGORY_CACHE_TTL = 10 * 60
+
+category_cache = TTLCache(maxsize=CATEGORY_CACHE_SIZE, ttl=CATEGORY_CACHE_TTL)
+
+def warm_category_cache():
+    """Carrega as categorias no cache na inicialização do worker."""
+    try:
+        rows = db.session.execute(
+            db.select(Category.normalized_name, Category.id, Category.name).limit(CATEGORY_CACHE_SIZE)
+        )
+        for normalized_name, category_id, name in rows:
+            category_cache.set(normalized_name, (category_id, name))
+    except SQLAlchemyError as e:
+        # Ex.: banco ainda sem migrações; o cache é preenchido conforme o uso
+        print(f"Cache de categorias não carregado: {e.__class__.__name__}")
+    finally:
+        db.session.remove()
+
+def _cached_category(category_id, name):
+    """Category persistente para o id em cache, sem consultar o banco."""
+    category = Category(id=category_id, name=name)
+    make_transient_to_detached(category)
+    return db.session.merge(category, load=False)
+
+# Categorias criadas só entram no cache depois do commit (um rollback as desfaria)
+@on_commit
+def _cache_created_categories(changes):
+    for normalized_name, (category_id, name) in changes.created_categories.items():
+        category_cache.set(normalized_name, (category_id, name))
+        category_suggester.add(normalized_name, category_id, name)
+
+def _resolve_categories(category_entities_data):
+    """Converte a lista 'categoryEntities' do payload em objetos Category.
+
+    Categorias conhecidas saem do cache, sem ir ao banco. As demais vêm de um único
+    SELECT ... IN pelo nome normalizado (índice único) e as que faltam são criadas
+    em um único INSERT ... ON CONFLICT DO NOTHING RETURNING. Se outra requisição
+    criar a mesma categoria ao mesmo tempo, o conflito é ignorado e a linha dela é
+    relida, sem IntegrityError. Nomes repetidos, sem diferenciar acentos e
+    maiúsculas, viram uma só categoria.
+    """
+    names = {}
+    for cat_data in category_entities_data:
+        cat_name = cat_data.get('name', '').strip()
+        if cat_name:
+            names.setdefault(fold(cat_name), cat_name)
+    if not names:
+        return []
+
+    found = {}
+    for normalized in names:
+        cached = category_cache.get(normalized)
+        if cached is not None:
+            found[normalized] = _cached_category(*cached)
+
+    unknown = [normalized for normalized in names if normalized not in found]
+    if unknown:
+        for category in Category.query.filter(Category.normalized_name.in_(unknown)):
+            found[category.normalized_name] = category
+            category_cache.set(category.normalized_name, (category.id, category.name))
+
+    missing = [{'name': names[normalized], 'normalized_name': normalized}
+               for normalized in unknown if normalized not in found]
+    if missing:
+        insert = postgresql_insert if db.session.get_bind().dialect.name == 'postgresql' else sqlite_insert
+        statement = insert(Category).values(missing).on_conflict_do_nothing().returning(Category)
+        created = pending_changes(db.session).created_categories
+        for category in db.session.scalars(statement):
+            found[category.normalized_name] = category
+            created[category.normalized_name] = (category.id, category.name)
+
+        raced = [normalized for normalized in names if normalized not in found]
+        if raced:
+            for category in Category.query.filter(Category.normalized_name.in_(raced)):
+                found[category.normalized_name] = category
+                category_cache.set(category.normalized_name, (category.id, category.name))
+    return [found[normalized] for normalized in names]
+
 # --- Rotas de Serviço ---
 @service_bp.route('/post/<int:user_id>', methods=['POST'])
 @jwt_required()
@@ -114,26 +554,17 @@ def create_service(user_id):
     try:
         image_bytes = base64.b64decode(service_image_base64.split(',')[1] if ',' in service_image_base64 else service_image_base64)
 
-        categories = []
-        for cat_data in category_entities_data:
-            cat_name = cat_data.get('name', '').strip()
-            if cat_name:
-                category = Category.query.filter(db.func.lower(Category.name) == db.func.lower(cat_name)).first()
-                if not category:
-                    category = Category(name=cat_name)
-                    db.session.add(category)
-                    db.session.flush()
-                categories.append(category)
+        categories = _resolve_categories(category_entities_data)
 
         service = Service(
             title=title,
             description=description,
             time_chronos=time_chronos,
-            service_image=image_bytes,
             deadline=deadline,
             modality=modality,
             user_entity=user
         )
+        service.set_image(image_bytes)
 
         service.categories = categories
 
@@ -149,18 +580,395 @@ def create_service(user_id):
 
 @service_bp.route('/get/<int:service_id>', methods=['GET'])
 def get_service_by_id(service_id):
-    service = Service.query.get(service_id)
-    if service:
-        return jsonify(service.to_dict()), 200
+    try:
+        fields = _parse_fields_arg(SERVICE_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    cached = _cached_response('service', service_id)
+    if cached:
+        return cached
+    generation = response_cache.generation('service', service_id)
+
+    # Versões do serviço e do dono (userEntity); não lê o restante da linha
+    versions = (db.session.query(Service.updated_at, User.updated_at)
+                .join(User, User.id == Service.user_id)
+                .filter(Service.id == service_id).first())
+    if not versions:
+        return jsonify({"error": "Serviço não encontrado."}), 404
+    etag = _version_etag('service', service_id, *versions)
+    last_modified = max(versions)
+    not_modified = _not_modified(etag, last_modified)
+    if not_modified:
+        return not_modified
+    cached = _cached_response('service', service_id, versions)
+    if cached:
+        return cached
+
+    service = Service.query.options(*service_read_options(fields)).filter_by(id=service_id).first()
+    if not service:
+        # Excluído entre a leitura da versão e a do serviço
+        return jsonify({"error": "Serviço não encontrado."}), 404
+    response = _with_validators(jsonify(service.to_dict(fields=fields)), etag, last_modified)
+    return _cache_response('service', service_id, generation, versions, response, etag, last_modified), 200
+
+MAX_BATCH_SIZE = 100
+
+def _parse_batch_ids():
+    """Ids pedidos, sem repetição e na ordem pedida.
+
+    GET: ?ids=1,2,3. POST: a lista JSON [1, 2, 3] ou {"ids": [1, 2, 3]}.
+    """
+    if request.method == 'POST':
+        data = request.get_json(silent=True)
+        raw_ids = data.get('ids') if isinstance(data, dict) else data
+        if not isinstance(raw_ids, list):
+            raise ValueError("O corpo deve ser uma lista de ids ou {\"ids\": [...]}.")
+        if any(isinstance(service_id, bool) for service_id in raw_ids):
+            raise ValueError("Parâmetro 'ids' inválido.")
     else:
+        raw_ids = [part for part in request.args.get('ids', '').split(',') if part.strip()]
+    try:
+        ids = list(dict.fromkeys(int(service_id) for service_id in raw_ids))
+    except (ValueError, TypeError):
+        raise ValueError("Parâmetro 'ids' inválido.")
+    if not all(_is_int64(service_id) for service_id in ids):
+        raise ValueError("Parâmetro 'ids' inválido.")
+    if not ids:
+        raise ValueError("Parâmetro 'ids' é obrigatório.")
+    if len(ids) > MAX_BATCH_SIZE:
+        raise ValueError(f"No máximo {MAX_BATCH_SIZE} ids por requisição.")
+    return ids
+
+@service_bp.route('/get/batch', methods=['GET', 'POST'])
+def get_services_batch():
+    try:
+        ids = _parse_batch_ids()
+        fields = _parse_fields_arg(SERVICE_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # Um único SELECT ... IN (mais o das categorias), devolvido na ordem pedida
+    services = service_dtos(service_rows_query(fields).filter(Service.id.in_(ids)).all(), fields)
+    by_id = {service.id: service for service in services}
+    return jsonify({
+        "items": [by_id[service_id].to_dict(fields=fields) for service_id in ids if service_id in by_id],
+        "missing": [service_id for service_id in ids if service_id not in by_id]
+    }), 200
+
+# Imagens servidas fora do JSON: bytes crus, ETag forte (hash do conteúdo) e cache longo
+IMAGE_MAX_AGE = 365 * 24 * 60 * 60
+
+def _image_cache_headers(response, image_hash):
+    """Define ETag e Cache-Control da imagem de um serviço."""
+    response.cache_control.public = True
+    if image_hash:
+        response.set_etag(image_hash)
+    if image_hash and request.args.get('v') == image_hash:
+        # URL versionada pelo hash: o conteúdo nunca muda para esta URL
+        response.cache_control.max_age = IMAGE_MAX_AGE
+        response.cache_control.immutable = True
+    else:
+        response.cache_control.no_cache = True
+    return response
+
+@service_bp.route('/<int:service_id>/image', methods=['GET'])
+def get_service_image(service_id):
+    row = db.session.query(Service.image_hash).filter(Service.id == service_id).first()
+    if not row:
         return jsonify({"error": "Serviço não encontrado."}), 404
 
+    # Revalidação: responde 304 sem carregar os bytes da imagem
+    image_hash = row.image_hash
+    if image_hash and request.if_none_match.contains(image_hash):
+        return _image_cache_headers(make_response('', 304), image_hash)
+
+    image = db.session.query(Service.service_image).filter(Service.id == service_id).scalar()
+    response = make_response(image)
+    response.headers['Content-Type'] = Service.detect_image_type(image)
+    return _image_cache_headers(response, image_hash)
+
+# Exportação em NDJSON (um serviço por linha), lida do banco em lotes
+STREAM_BATCH_SIZE = 500
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+def _wants_stream():
+    if request.args.get('stream') == '1':
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+def _stream_services(query, fields):
+    """Resposta NDJSON gerada lote a lote: a memória fica em um lote, qualquer que seja o total."""
+    result = db.session.execute(query.statement, execution_options={'yield_per': STREAM_BATCH_SIZE})
+    dumps = current_app.json.dumps
+
+    def generate():
+        for rows in result.partitions():
+            yield ''.join(dumps(service.to_dict(fields=fields)) + '\n' for service in service_dtos(rows, fields))
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
+
 @service_bp.route('/get/all', methods=['GET'])
 @jwt_required()
 def get_all_services():
-    services = Service.query.all()
-    services_data = [service.to_dict() for service in services]
-    return jsonify(services_data), 200
+    try:
+        sort = _parse_sort_arg()
+        fields = _parse_fields_arg(SERVICE_FIELDS)
+        filters = _read_service_filters()
+        # Sem 'limit' nem 'cursor' mantém a resposta antiga (lista completa)
+        paginated = 'limit' in request.args or 'cursor' in request.args
+        query = _apply_service_filters(
+            service_rows_query(fields, _sort_columns(sort), with_versions=paginated), filters)
+
+        # stream=1 ou Accept: application/x-ndjson devolve o catálogo filtrado inteiro
+        if _wants_stream():
+            return _stream_services(_order_services(query, sort), fields)
+
+        if paginated:
+            limit, cursor = _parse_page_args()
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    if not paginated:
+        etag = _collection_etag(_apply_service_filters(db.session.query(Service.id), filters), fields)
+        not_modified = _not_modified(etag)
+        if not_modified:
+            return not_modified
+        services = service_dtos(_order_services(query, sort).all(), fields)
+        services_data = [service.to_dict(fields=fields) for service in services]
+        return _with_validators(jsonify(services_data), etag), 200
+
+    # Páginas: o ETag vem das linhas da própria página (busca custa o mesmo que
+    # antes; o 304 poupa a serialização e a transferência)
+    try:
+        rows, next_cursor = _paginate_services(query, limit, cursor, sort)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    etag = _page_etag(rows, next_cursor)
+    not_modified = _not_modified(etag)
+    if not_modified:
+        return not_modified
+
+    return _with_validators(jsonify({
+        "items": [service.to_dict(fields=fields) for service in service_dtos(rows, fields)],
+        "next_cursor": next_cursor
+    }), etag), 200
+
+# Sincronização incremental: alterações desde um número de sequência
+DEFAULT_CHANGES_PAGE_SIZE = 500
+MAX_CHANGES_PAGE_SIZE = 1000
+
+@service_bp.route('/changes', methods=['GET'])
+@jwt_required()
+def get_service_changes():
+    """Serviços criados/alterados e ids excluídos desde 'since' (0 ou ausente: catálogo inteiro).
+
+    O cliente guarda 'next_since' e repete enquanto 'has_more' for verdadeiro.
+    """
+    try:
+        since = _parse_int_arg('since', 0)
+        limit = _parse_int_arg('limit', DEFAULT_CHANGES_PAGE_SIZE)
+        if since < 0:
+            raise ValueError("Parâmetro 'since' inválido.")
+        if limit <= 0:
+            raise ValueError("Parâmetro 'limit' inválido.")
+        limit = min(limit, MAX_CHANGES_PAGE_SIZE)
+        fields = _parse_fields_arg(SERVICE_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    changes, has_more = changes_since(since, limit)
+    upserted_ids = [service_id for _, service_id, op in changes if op == ServiceChange.OP_UPSERT]
+    services = {}
+    if upserted_ids:
+        rows = service_rows_query(fields).filter(Service.id.in_(upserted_ids)).all()
+        services = {service.id: service for service in service_dtos(rows, fields)}
+
+    return jsonify({
+        # Na ordem do registro; um serviço excluído depois da leitura do registro fica de fora
+        "items": [services[service_id].to_dict(fields=fields) for service_id in upserted_ids if service_id in services],
+        "deleted": [service_id for _, service_id, op in changes if op == ServiceChange.OP_DELETE],
+        "next_since": changes[-1][0] if changes else since,
+        "has_more": has_more
+    }), 200
+
+# --- Feeds de eventos (SSE) ---
+# Comentário periódico que mantém a conexão viva em proxies e revela clientes que
+# já desconectaram (a escrita falha e o gerador é fechado)
+SSE_HEARTBEAT_SECONDS = 15
+# Espera sugerida ao EventSource antes de reconectar
+SSE_RETRY_MS = 5000
+
+def _event_stream(subscription, initial=()):
+    """Resposta text/event-stream com 'initial' e, depois, os eventos de 'subscription'.
+
+    Cada item é um par (nome do evento, dados). A inscrição é feita pela rota
+    antes de ler o estado inicial, para que nenhuma alteração entre a leitura e o
+    início do envio se perca; ela é encerrada quando a resposta é fechada.
+    Sem stream_with_context: o contexto da requisição (e a sessão do banco) é
+    liberado antes do envio, então uma conexão ociosa só ocupa sua fila no broker.
+    O feed termina quando o token expira; o cliente reconecta com um token novo.
+    Uma fila que transbordou vira um evento 'resync'.
+    """
+    dumps = current_app.json.dumps
+    expires_at = get_jwt()['exp']
+
+    def format_events(items):
+        return ''.join(f"event: {name}\ndata: {dumps(data)}\n\n" for name, data in items)
+
+    def generate():
+        yield f"retry: {SSE_RETRY_MS}\n\n" + format_events(initial)
+        while time.time() < expires_at:
+            items, dropped = subscription.get(min(SSE_HEARTBEAT_SECONDS, expires_at - time.time()))
+            if dropped:
+                yield format_events([('resync', {'dropped': dropped})])
+            yield format_events(items) if items else ": ping\n\n"
+
+    response = Response(generate(), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # Sem buffer no nginx
+    response.call_on_close(subscription.close)
+    return response
+
+@service_bp.route('/stream', methods=['GET'])
+@jwt_required()
+def stream_services():
+    """Eventos 'service' ({type: created|updated|deleted, id}) a cada serviço criado, editado ou excluído."""
+    return _event_stream(subscribe(SERVICES_CHANNEL))
+
+def _parse_threshold_arg():
+    value = request.args.get('threshold')
+    if value is None or value == '':
+        return DEFAULT_SIMILARITY_THRESHOLD
+    try:
+        threshold = float(value)
+    except ValueError:
+        threshold = -1
+    if not 0 < threshold <= 1:
+        raise ValueError("Parâmetro 'threshold' inválido. Use um valor entre 0 e 1.")
+    return threshold
+
+@service_bp.route('/search', methods=['GET'])
+@jwt_required()
+def search_services():
+    text = request.args.get('q', '').strip()
+    if not text:
+        return jsonify({"error": "Parâmetro 'q' é obrigatório."}), 400
+
+    try:
+        limit = _parse_int_arg('limit', DEFAULT_PAGE_SIZE)
+        if limit <= 0:
+            raise ValueError("Parâmetro 'limit' inválido.")
+        limit = min(limit, MAX_PAGE_SIZE)
+        threshold = _parse_threshold_arg()
+        fields = _parse_fields_arg(SERVICE_FIELDS)
+        query = _apply_service_filters(service_rows_query(fields))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    # fuzzy=1 força a busca aproximada; sem ele, ela só é usada quando a busca
+    # exata (FTS5 bm25 / ts_rank, por relevância) não encontra nada
+    fuzzy = request.args.get('fuzzy') == '1'
+    rows = [] if fuzzy else filter_by_text(query, text).limit(limit).all()
+    if not rows:
+        rows = fuzzy_search(query, text, threshold, limit)
+        fuzzy = True
+
+    return jsonify({
+        "items": [service.to_dict(fields=fields) for service in service_dtos(rows, fields)],
+        "fuzzy": fuzzy
+    }), 200
+
+# --- Facetas da listagem ---
+# Contagens por categoria, modalidade e faixa de chronos (as faixas de 5 do slider
+# em Main.js) sobre o conjunto filtrado. Cada faceta ignora o próprio filtro
+# (facetas disjuntivas), para o painel continuar mostrando as alternativas.
+CHRONOS_BUCKET_SIZE = 5
+DEFAULT_FACET_LIMIT = 20
+MAX_FACET_LIMIT = 100
+FACET_CACHE_SIZE = 1000
+FACET_CACHE_TTL = 60
+facet_cache = TTLCache(maxsize=FACET_CACHE_SIZE, ttl=FACET_CACHE_TTL)
+
+@on_commit
+def _clear_facet_cache(changes):
+    # Qualquer escrita em serviços pode mudar qualquer contagem: descarta tudo
+    if changes.services:
+        facet_cache.clear()
+
+def _compute_facets(text, filters, limit):
+    """Contagens de cada faceta; 'text' é o termo de busca original (ou vazio)."""
+    def matching_ids(skip):
+        query = _apply_service_filters(Service.query, filters, skip)
+        if text:
+            query = filter_by_text(query, text)
+        return query.order_by(None).with_entities(Service.id)
+
+    usage = db.func.count(service_categories.c.service_id)
+    categories = db.session.execute(
+        db.select(Category.id, Category.name, usage)
+        .join(service_categories, service_categories.c.category_id == Category.id)
+        .where(service_categories.c.service_id.in_(matching_ids(('category',))))
+        .group_by(Category.id, Category.name)
+        .order_by(usage.desc(), Category.name)
+        .limit(limit)
+    ).all()
+
+    modality_count = db.func.count(Service.id)
+    modalities = db.session.execute(
+        db.select(Service.modality, modality_count)
+        .where(Service.id.in_(matching_ids(('modality',))))
+        .group_by(Service.modality)
+        .order_by(modality_count.desc(), Service.modality)
+    ).all()
+
+    # Faixa pelo limite superior, como no slider: 0-5, 6-10, 11-15...
+    bucket = db.case(
+        (Service.time_chronos <= CHRONOS_BUCKET_SIZE, CHRONOS_BUCKET_SIZE),
+        else_=(Service.time_chronos + CHRONOS_BUCKET_SIZE - 1) // CHRONOS_BUCKET_SIZE * CHRONOS_BUCKET_SIZE,
+    ).label('bucket')
+    buckets = db.session.execute(
+        db.select(bucket, db.func.count(Service.id))
+        .where(Service.id.in_(matching_ids(('chronos',))))
+        .group_by(bucket)
+        .order_by(bucket)
+    ).all()
+
+    total = db.session.execute(
+        db.select(db.func.count()).select_from(matching_ids(()).subquery())
+    ).scalar_one()
+
+    return {
+        "total": total,
+        "categories": [{"id": category_id, "name": name, "count": count} for category_id, name, count in categories],
+        "modalities": [{"value": value, "count": count} for value, count in modalities if value],
+        "chronos": [
+            {"min": 0 if upper == CHRONOS_BUCKET_SIZE else upper - CHRONOS_BUCKET_SIZE + 1, "max": upper, "count": count}
+            for upper, count in buckets
+        ],
+    }
+
+@service_bp.route('/facets', methods=['GET'])
+@jwt_required()
+def get_service_facets():
+    """Facetas para os mesmos filtros de /service/get/all, mais 'q' (busca exata, sem a aproximada)."""
+    try:
+        filters = _read_service_filters()
+        limit = _parse_int_arg('facet_limit', DEFAULT_FACET_LIMIT)
+        if limit <= 0:
+            raise ValueError("Parâmetro 'facet_limit' inválido.")
+        limit = min(limit, MAX_FACET_LIMIT)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    text = request.args.get('q', '').strip()
+    key = (normalize_for_search(text), limit) + tuple(str(value) if value is not None else None for value in filters.values())
+    facets = facet_cache.get(key)
+    if facets is None:
+        facets = _compute_facets(text, filters, limit)
+        facet_cache.set(key, facets)
+    return jsonify(facets), 200
 
 @service_bp.route('/put/<int:service_id>', methods=['PUT'])
 @jwt_required()
@@ -192,19 +1000,11 @@ def update_service(service_id):
         service.modality = modality
 
         if service_image_base64:
-            service.service_image = base64.b64decode(service_image_base64.split(',')[1] if ',' in service_image_base64 else service_image_base64)
-
-        categories = []
-        for cat_data in category_entities_data:
-            cat_name = cat_data.get('name', '').strip()
-            if cat_name:
-                category = Category.query.filter(db.func.lower(Category.name) == db.func.lower(cat_name)).first()
-                if not category:
-                    category = Category(name=cat_name)
-                    db.session.add(category)
-                    db.session.flush()
-                categories.append(category)
-        service.categories = categories
+            service.set_image(base64.b64decode(service_image_base64.split(',')[1] if ',' in service_image_base64 else service_image_base64))
+
+        service.categories = _resolve_categories(category_entities_data)
+        # Garante nova versão mesmo quando só as categorias mudaram
+        service.touch()
 
         db.session.commit()
         return jsonify(service.to_dict()), 200
@@ -260,30 +1060,117 @@ def accept_service(service_id):
         "accepted_by": user_id
     }), 200
 
+# --- Rotas de Categoria ---
+DEFAULT_SUGGESTIONS = 10
+MAX_SUGGESTIONS = 50
+
+@category_bp.route('/suggest', methods=['GET'])
+@jwt_required()
+def suggest_categories():
+    try:
+        limit = _parse_int_arg('limit', DEFAULT_SUGGESTIONS)
+        if limit <= 0:
+            raise ValueError("Parâmetro 'limit' inválido.")
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    prefix = request.args.get('prefix', '').strip()
+    return jsonify(category_suggester.suggest(prefix, min(limit, MAX_SUGGESTIONS))), 200
+
 # --- Rotas de Usuário ---
+def _user_response(user_id, fields):
+    """Dados do usuário com ETag/Last-Modified (304 se não mudou); None se não existe."""
+    cached = _cached_response('user', user_id)
+    if cached:
+        return cached
+    generation = response_cache.generation('user', user_id)
+
+    updated_at = db.session.query(User.updated_at).filter(User.id == user_id).scalar()
+    if updated_at is None:
+        return None
+    etag = _version_etag('user', user_id, updated_at)
+    not_modified = _not_modified(etag, updated_at)
+    if not_modified:
+        return not_modified
+    cached = _cached_response('user', user_id, (updated_at,))
+    if cached:
+        return cached
+
+    user = User.query.options(*user_read_options(fields)).get(user_id)
+    if not user:
+        return None
+    response = _with_validators(jsonify(user.to_dict(include_document=False, fields=fields)), etag, updated_at)
+    return _cache_response('user', user_id, generation, (updated_at,), response, etag, updated_at)
+
 @user_bp.route('/get', methods=['GET'])
 @jwt_required()
 def get_current_user():
+    try:
+        fields = _parse_fields_arg(USER_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
     current_user_id = int(get_jwt_identity())
-    user = User.query.get(current_user_id)
-    if user:
-        return jsonify(user.to_dict(include_document=False)), 200
-    return jsonify({"error": "Usuário não encontrado."}), 404
+    response = _user_response(current_user_id, fields)
+    if response is None:
+        return jsonify({"error": "Usuário não encontrado."}), 404
+    return response
+
 
+@user_bp.route('/services', methods=['GET'])
+@jwt_required()
+def get_current_user_services():
+    """Serviços do usuário logado, paginados por cursor (mais recentes primeiro por padrão)."""
+    current_user_id = int(get_jwt_identity())
+    try:
+        sort = _parse_sort_arg() or 'newest'
+        limit, cursor = _parse_page_args()
+        # Por padrão, todos os campos menos o dono (é o próprio usuário logado)
+        fields = _parse_fields_arg(SERVICE_FIELDS) or [field for field in SERVICE_FIELDS if field != 'userEntity']
+        # Usa o índice (user_id, id); sem o JOIN em users nem as colunas adiadas
+        query = service_rows_query(fields, _sort_columns(sort)).filter(Service.user_id == current_user_id)
+        rows, next_cursor = _paginate_services(query, limit, cursor, sort)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    return jsonify({
+        "items": [service.to_dict(fields=fields) for service in service_dtos(rows, fields)],
+        "next_cursor": next_cursor
+    }), 200
+
+@user_bp.route('/stream', methods=['GET'])
+@jwt_required()
+def stream_current_user():
+    """Eventos 'balance' ({timeChronos}) do usuário logado: o saldo atual ao
+    conectar e o novo saldo a cada compra, venda ou transferência.
+
+    Substitui o GET /user/get que cada página fazia só para mostrar o saldo.
+    """
+    current_user_id = int(get_jwt_identity())
+    subscription = subscribe(user_channel(current_user_id))
+    balance = db.session.query(User.time_chronos).filter(User.id == current_user_id).scalar()
+    if balance is None:
+        subscription.close()
+        return jsonify({"error": "Usuário não encontrado."}), 404
+    return _event_stream(subscription, [('balance', {'timeChronos': balance})])
 
 @user_bp.route('/get/<int:user_id>', methods=['GET'])
 def get_user_by_id(user_id):
-    user = User.query.get(user_id)
-    if user:
-        return jsonify(user.to_dict(include_document=False)), 200
-    else:
+    try:
+        fields = _parse_fields_arg(USER_FIELDS)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+
+    response = _user_response(user_id, fields)
+    if response is None:
         return jsonify({"error": "Usuário não encontrado."}), 404
+    return response
 
 @user_bp.route('/get/document/<int:user_id>', methods=['GET'])
 def get_user_document(user_id):
-    user = User.query.get(user_id)
-    if user and user.document:
-        return user.document.data, 200, {'Content-Type': user.document.type, 'Content-Disposition': f'inline; filename="{user.document.name}"'}
+    document = Document.query.options(db.undefer(Document.data)).filter_by(user_id=user_id).first()
+    if document:
+        return document.data, 200, {'Content-Type': document.type, 'Content-Disposition': f'inline; filename="{document.name}"'}
     return jsonify({"error": "Documento não encontrado."}), 404
 
 
@@ -0,0 +1,410 @@
+# search.py
+# Busca textual (full-text) sobre título e descrição dos serviços.
+#
+# O índice guarda as colunas normalizadas search_title/search_body (sem acentos e
+# radicalizadas por normalization.py na escrita); a consulta passa pela mesma
+# normalização, então "manutencao" encontra "Manutenção".
+#
+# - SQLite: tabela virtual FTS5 'services_fts' (rowid = services.id), mantida em
+#   sincronia pelos eventos de mapper abaixo, disparados pelas escritas de
+#   create_service, update_service e delete_service na mesma transação.
+# - Postgres: coluna gerada 'services.search_vector' (tsvector, configuração
+#   'simple' sobre as colunas já normalizadas) com índice GIN, mantida pelo banco.
+# As duas estruturas são criadas pela migração; fora do modelo, para não afetar
+# o outro banco.
+#
+# Busca aproximada (tolerante a erros de digitação) por trigramas sobre as palavras
+# do título e das categorias: pg_trgm com índices GIN no Postgres e, no SQLite, um
+# índice invertido de trigramas em memória (TrigramIndex), por worker.
+import heapq
+import threading
+import time
+from bisect import bisect_left
+from collections import Counter
+
+import sqlalchemy as sa
+
+from commit_hooks import on_commit
+from models import db, Service, Category, service_categories
+from normalization import fold, normalize_for_search
+
+FTS_TABLE = 'services_fts'
+SEARCH_VECTOR_COLUMN = 'search_vector'
+TEXT_SEARCH_CONFIG = 'simple'  # O texto já chega normalizado e radicalizado
+TITLE_WEIGHT = 10.0  # Peso do título em relação à descrição no bm25
+
+FTS_CREATE_SQL = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} "
+    "USING fts5(title, description, tokenize = 'unicode61 remove_diacritics 2')"
+)  # Colunas com o conteúdo de search_title e search_body
+
+_fts_table = sa.table(FTS_TABLE, sa.column('rowid'), sa.column('title'), sa.column('description'))
+
+# Bancos criados com db.create_all() (sem migração) também ganham a tabela FTS5, e
+# db.drop_all() a remove: senão ela sobrevive com as linhas de ids que serão reusados
+sa.event.listen(Service.__table__, 'after_create', sa.DDL(FTS_CREATE_SQL).execute_if(dialect='sqlite'))
+sa.event.listen(Service.__table__, 'after_drop',
+                sa.DDL(f'DROP TABLE IF EXISTS {FTS_TABLE}').execute_if(dialect='sqlite'))
+
+
+def include_object(object, name, type_, reflected, compare_to):
+    """Esconde do autogenerate do Alembic os objetos de busca que não estão no modelo."""
+    if type_ == 'table' and name.startswith(FTS_TABLE):
+        return False
+    if type_ == 'column' and name == SEARCH_VECTOR_COLUMN:
+        return False
+    if type_ == 'index' and (name == 'ix_services_search_vector' or name.endswith('_trgm')):
+        return False
+    return True
+
+
+# --- Sincronização do índice FTS5 (SQLite) ---
+def _index_service(connection, service):
+    connection.execute(_fts_table.delete().where(_fts_table.c.rowid == service.id))
+    connection.execute(_fts_table.insert().values(
+        rowid=service.id, title=service.search_title, description=service.search_body
+    ))
+
+@sa.event.listens_for(Service, 'after_insert')
+def _after_service_insert(mapper, connection, service):
+    if connection.dialect.name == 'sqlite':
+        _index_service(connection, service)
+
+@sa.event.listens_for(Service, 'after_update')
+def _after_service_update(mapper, connection, service):
+    if connection.dialect.name != 'sqlite':
+        return
+    state = sa.inspect(service)
+    if state.attrs.title.history.has_changes() or state.attrs.description.history.has_changes():
+        _index_service(connection, service)
+
+@sa.event.listens_for(Service, 'after_delete')
+def _after_service_delete(mapper, connection, service):
+    if connection.dialect.name == 'sqlite':
+        connection.execute(_fts_table.delete().where(_fts_table.c.rowid == service.id))
+
+
+# --- Consulta ---
+def _fts_match_expression(text):
+    """Monta uma expressão MATCH segura com as palavras entre aspas (AND implícito).
+
+    Só a última palavra vira prefixo (busca enquanto digita); prefixos nas demais
+    expandiriam para muitos termos sem ajudar a relevância.
+    """
+    words = [f'"{word}"' for word in normalize_for_search(text).split()]
+    if words:
+        words[-1] += '*'
+    return ' '.join(words)
+
+def filter_by_text(query, text):
+    """Restringe 'query' (sobre Service) aos serviços que casam com 'text', por relevância."""
+    if db.engine.dialect.name == 'postgresql':
+        ts_query = sa.func.plainto_tsquery(TEXT_SEARCH_CONFIG, normalize_for_search(text))
+        vector = sa.literal_column(f'services.{SEARCH_VECTOR_COLUMN}')
+        return (query.filter(vector.op('@@')(ts_query))
+                .order_by(sa.func.ts_rank(vector, ts_query).desc(), Service.id))
+
+    match = _fts_match_expression(text)
+    if not match:
+        return query.filter(sa.false())
+    # MATCH numa subconsulta com LIMIT -1 (sem limite, mas impede o SQLite de
+    # achatá-la): com o join direto o planejador pode preferir varrer services por
+    # outro índice (ex.: modality) e reavaliar o MATCH a cada linha
+    matches = (sa.select(_fts_table.c.rowid.label('id'),
+                         sa.literal_column(f'bm25({FTS_TABLE}, {TITLE_WEIGHT}, 1.0)').label('rank'))
+               .select_from(_fts_table)
+               .where(sa.text(f'{FTS_TABLE} MATCH :match').bindparams(match=match))
+               .limit(-1)
+               .subquery('fts_matches'))
+    return (query.join(matches, matches.c.id == Service.id)
+            .order_by(matches.c.rank, Service.id))
+
+
+# --- Busca aproximada por trigramas ---
+DEFAULT_SIMILARITY_THRESHOLD = 0.3  # Mesmo padrão do pg_trgm
+MAX_FUZZY_CANDIDATES = 1000  # Ids por IN ao aplicar os filtros da consulta aos candidatos
+
+def trigrams(word):
+    """Trigramas de uma palavra, com o mesmo preenchimento do pg_trgm ('  pal ')."""
+    padded = f'  {word} '
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class _TrigramPostings:
+    """Índices invertidos palavra -> serviços e trigrama -> palavras."""
+
+    def __init__(self):
+        self.service_words = {}
+        self.word_services = {}
+        self.word_trigrams = {}
+        self.trigram_words = {}
+
+    def add(self, service_id, words):
+        self.service_words[service_id] = words
+        for word in words:
+            if word not in self.word_services:
+                self.word_services[word] = set()
+                grams = trigrams(word)
+                self.word_trigrams[word] = grams
+                for gram in grams:
+                    self.trigram_words.setdefault(gram, set()).add(word)
+            self.word_services[word].add(service_id)
+
+    def remove(self, service_id):
+        for word in self.service_words.pop(service_id, ()):
+            ids = self.word_services[word]
+            ids.discard(service_id)
+            if not ids:
+                del self.word_services[word]
+                for gram in self.word_trigrams.pop(word):
+                    self.trigram_words[gram].discard(word)
+
+
+class TrigramIndex:
+    """Índice invertido palavra -> serviços e trigrama -> palavras, em memória.
+
+    A similaridade entre palavras é a de Jaccard sobre os trigramas (como o
+    similarity() do pg_trgm). O índice é carregado do banco na primeira busca,
+    atualizado para os serviços alterados por este worker e recarregado por
+    inteiro a cada REBUILD_INTERVAL segundos para refletir os demais workers.
+
+    A leitura do banco e a montagem do índice novo acontecem fora de '_lock', que
+    protege só a troca e as buscas: durante uma recarga as buscas seguem no índice
+    anterior. '_update_lock' deixa uma única thread atualizando por vez; os
+    demais não esperam por ele (exceto na primeira carga, quando não há índice).
+    """
+
+    REBUILD_INTERVAL = 300
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._built_at = None
+        self._stale_ids = set()
+        self._postings = _TrigramPostings()
+
+    def mark_stale(self, service_ids):
+        """Marca serviços alterados para serem relidos do banco na próxima busca."""
+        with self._lock:
+            self._stale_ids.update(service_ids)
+
+    def _load(self, service_ids=None):
+        """Lê do banco as palavras dos serviços (todos, ou só 'service_ids')."""
+        words = {}
+        titles = db.select(Service.id, Service.search_title)
+        category_names = (db.select(service_categories.c.service_id, Category.name)
+                          .join(Category, Category.id == service_categories.c.category_id))
+        if service_ids is not None:
+            titles = titles.where(Service.id.in_(service_ids))
+            category_names = category_names.where(service_categories.c.service_id.in_(service_ids))
+        for service_id, search_title in db.session.execute(titles):
+            words[service_id] = set(search_title.split())
+        for service_id, name in db.session.execute(category_names):
+            if service_id in words:
+                words[service_id].update(normalize_for_search(name).split())
+        return words
+
+    def _expired(self):
+        return self._built_at is None or time.monotonic() - self._built_at > self.REBUILD_INTERVAL
+
+    def _refresh(self):
+        if not self._expired() and not self._stale_ids:
+            return
+        if not self._update_lock.acquire(blocking=self._built_at is None):
+            return  # Outra thread já está atualizando; busca no índice atual
+        try:
+            if self._expired():
+                postings = _TrigramPostings()
+                for service_id, words in self._load().items():
+                    postings.add(service_id, words)
+                with self._lock:
+                    self._postings = postings
+                    self._built_at = time.monotonic()
+            # Serviços marcados durante a recarga podem ter sido lidos antes da
+            # alteração: são relidos depois da troca, como os demais pendentes
+            with self._lock:
+                stale, self._stale_ids = self._stale_ids, set()
+            if stale:
+                fresh = self._load(stale)
+                with self._lock:
+                    for service_id in stale:
+                        self._postings.remove(service_id)
+                        if service_id in fresh:
+                            self._postings.add(service_id, fresh[service_id])
+        finally:
+            self._update_lock.release()
+
+    def search(self, text, threshold, limit=MAX_FUZZY_CANDIDATES):
+        """Retorna [(service_id, score)] por score decrescente (todos, com limit=None).
+
+        Cada palavra da consulta casa com a palavra mais parecida de cada serviço
+        (similaridade >= threshold); o score é a média dessas similaridades.
+        """
+        query_words = normalize_for_search(text).split()
+        if not query_words:
+            return []
+        scores = Counter()
+        self._refresh()
+        with self._lock:
+            postings = self._postings
+            for query_word in query_words:
+                query_grams = trigrams(query_word)
+                shared = Counter()
+                for gram in query_grams:
+                    for word in postings.trigram_words.get(gram, ()):
+                        shared[word] += 1
+                best = {}
+                for word, common in shared.items():
+                    similarity = common / (len(query_grams) + len(postings.word_trigrams[word]) - common)
+                    if similarity >= threshold:
+                        for service_id in postings.word_services[word]:
+                            if similarity > best.get(service_id, 0):
+                                best[service_id] = similarity
+                scores.update(best)
+        return [(service_id, score / len(query_words)) for service_id, score in scores.most_common(limit)]
+
+
+trigram_index = TrigramIndex()
+
+@on_commit
+def _mark_changed_services(changes):
+    if changes.services:
+        trigram_index.mark_stale(changes.services)
+
+
+def fuzzy_search(query, text, threshold=DEFAULT_SIMILARITY_THRESHOLD, limit=20):
+    """Serviços de 'query' parecidos com 'text' no título ou nas categorias, por similaridade."""
+    normalized = normalize_for_search(text)
+    if not normalized:
+        return []
+
+    if db.engine.dialect.name == 'postgresql':
+        # '<%' (word similarity) usa os índices GIN gin_trgm_ops; o limiar vale só nesta transação
+        db.session.execute(sa.text("SELECT set_config('pg_trgm.word_similarity_threshold', :t, true)"),
+                           {'t': str(threshold)})
+        title_similarity = sa.func.word_similarity(normalized, Service.search_title)
+        category_match = Service.categories.any(sa.literal(normalized).op('<%')(Category.normalized_name))
+        return (query.filter(db.or_(sa.literal(normalized).op('<%')(Service.search_title), category_match))
+                .order_by(title_similarity.desc(), Service.id)
+                .limit(limit).all())
+
+    ranked = sorted(trigram_index.search(text, threshold, limit=None), key=lambda item: (-item[1], item[0]))
+    if not ranked:
+        return []
+    # Os filtros da consulta (categoria, tempo, modalidade...) valem para todos os
+    # candidatos, e não só para os mais parecidos: eles são aplicados em lotes de
+    # MAX_FUZZY_CANDIDATES ids, do maior score para o menor, até reunir 'limit'
+    # serviços. Como os lotes seguem o score, os primeiros encontrados são os melhores.
+    scores = dict(ranked)
+    best_ids = []
+    for start in range(0, len(ranked), MAX_FUZZY_CANDIDATES):
+        chunk = [service_id for service_id, _ in ranked[start:start + MAX_FUZZY_CANDIDATES]]
+        matched = {row.id for row in query.with_entities(Service.id).filter(Service.id.in_(chunk))}
+        best_ids += [service_id for service_id in chunk if service_id in matched]
+        if len(best_ids) >= limit:
+            break
+    best_ids = best_ids[:limit]
+    if not best_ids:
+        return []
+    services = query.filter(Service.id.in_(best_ids)).all()
+    services.sort(key=lambda service: (-scores[service.id], service.id))
+    return services
+
+
+# --- Sugestão de categorias por prefixo ---
+class CategorySuggester:
+    """Nomes normalizados das categorias em um array ordenado, com contagem de uso.
+
+    O prefixo é localizado por busca binária e, dentro do intervalo, ficam as
+    'limit' categorias mais usadas. Recarregado do banco a cada REFRESH_INTERVAL
+    segundos (ou após invalidate()); categorias criadas neste worker entram nos
+    arrays por add(), sem refazer a consulta agrupada.
+
+    Como no TrigramIndex, a consulta agrupada roda fora de '_lock', que protege só
+    a troca dos arrays e as buscas: durante uma recarga as sugestões saem dos
+    arrays anteriores. '_update_lock' deixa uma única thread recarregando; as
+    demais não esperam por ele, exceto na primeira carga e depois de
+    invalidate(), quando os arrays não valem mais.
+    """
+
+    REFRESH_INTERVAL = 60
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._update_lock = threading.Lock()
+        self._loaded_at = None
+        self._keys = []     # nomes normalizados, ordenados
+        self._entries = []  # (uso, id, nome) na mesma ordem de _keys
+        self._refreshing = False
+        self._added_during_refresh = []
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    @staticmethod
+    def _insert(keys, entries, normalized_name, category_id, name):
+        position = bisect_left(keys, normalized_name)
+        if position < len(keys) and keys[position] == normalized_name:
+            return
+        keys.insert(position, normalized_name)
+        entries.insert(position, (0, category_id, name))
+
+    def add(self, normalized_name, category_id, name):
+        """Insere uma categoria nova na posição ordenada; o uso real vem na próxima recarga."""
+        with self._lock:
+            if self._refreshing:
+                # A recarga em andamento pode ter lido o banco antes desta categoria
+                self._added_during_refresh.append((normalized_name, category_id, name))
+            if self._loaded_at is None:
+                return  # A próxima carga já a lê do banco
+            self._insert(self._keys, self._entries, normalized_name, category_id, name)
+
+    def _expired(self):
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > self.REFRESH_INTERVAL
+
+    def _refresh(self):
+        if not self._expired():
+            return
+        if not self._update_lock.acquire(blocking=self._loaded_at is None):
+            return  # Outra thread já está recarregando; sugere a partir dos arrays atuais
+        try:
+            if not self._expired():
+                return
+            with self._lock:
+                self._refreshing = True
+            try:
+                usage = sa.func.count(service_categories.c.service_id)
+                rows = db.session.execute(
+                    db.select(Category.normalized_name, Category.id, Category.name, usage)
+                    .outerjoin(service_categories, service_categories.c.category_id == Category.id)
+                    .group_by(Category.id)
+                    .order_by(Category.normalized_name)
+                ).all()
+                keys = [row[0] for row in rows]
+                entries = [(row[3], row[1], row[2]) for row in rows]
+            finally:
+                with self._lock:
+                    self._refreshing = False
+                    added, self._added_during_refresh = self._added_during_refresh, []
+            with self._lock:
+                for normalized_name, category_id, name in added:
+                    self._insert(keys, entries, normalized_name, category_id, name)
+                self._keys = keys
+                self._entries = entries
+                self._loaded_at = time.monotonic()
+        finally:
+            self._update_lock.release()
+
+    def suggest(self, prefix, limit):
+        """Até 'limit' categorias cujo nome normalizado começa com 'prefix', das mais usadas."""
+        prefix = fold(prefix)
+        self._refresh()
+        with self._lock:
+            start = bisect_left(self._keys, prefix)
+            end = bisect_left(self._keys, prefix + '\U0010ffff', lo=start)
+            best = heapq.nsmallest(limit, self._entries[start:end], key=lambda entry: (-entry[0], entry[2]))
+        return [{'id': category_id, 'name': name, 'usageCount': usage} for usage, category_id, name in best]
+
+
+category_suggester = CategorySuggester()
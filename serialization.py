@@ -0,0 +1,143 @@
+# serialization.py
+# Caminho rápido de serialização das listagens: provedor JSON com orjson (quando
+# instalado) e DTOs compactos (__slots__) montados direto das linhas do SELECT,
+# sem passar pelo mapeamento de objetos do ORM.
+from flask.json.provider import DefaultJSONProvider
+
+from models import db, User, Service, Category, service_categories, SERVICE_FIELDS
+
+try:
+    import orjson
+except ImportError:  # Opcional: sem ele, o app usa o provedor JSON padrão do Flask
+    orjson = None
+
+
+class ORJSONProvider(DefaultJSONProvider):
+    """Provedor JSON do Flask que serializa com orjson.
+
+    Mantém o contrato do padrão: chaves ordenadas, datas no formato HTTP e os
+    demais tipos via DefaultJSONProvider.default. Em modo debug (saída indentada)
+    usa o caminho padrão.
+    """
+
+    def _options(self):
+        options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+        if self.sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        return options
+
+    def dumps(self, obj, **kwargs):
+        if kwargs:
+            return super().dumps(obj, **kwargs)
+        return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+
+    def response(self, *args, **kwargs):
+        if (self.compact is None and self._app.debug) or self.compact is False:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        body = orjson.dumps(obj, default=self.default, option=self._options() | orjson.OPT_APPEND_NEWLINE)
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def configure_json(app):
+    """Usa o ORJSONProvider se o orjson estiver instalado."""
+    if orjson is not None:
+        app.json = ORJSONProvider(app)
+
+
+# --- DTOs ---
+# Mesmos nomes de atributo dos modelos, para que SERVICE_FIELDS e Service.to_dict()
+# sirvam aos dois. Atributos não carregados ficam sem valor (AttributeError ao ler).
+class UserDTO:
+    __slots__ = ('id', 'name', 'email')
+
+    def __init__(self, user_id, name, email):
+        self.id = user_id
+        self.name = name
+        self.email = email
+
+
+class CategoryDTO:
+    __slots__ = ('id', 'name')
+
+    def __init__(self, category_id, name):
+        self.id = category_id
+        self.name = name
+
+
+class ServiceDTO:
+    __slots__ = ('id', 'title', 'description', 'time_chronos', 'image_hash', 'deadline', 'modality',
+                 'user_id', 'user_entity', 'categories')
+
+    image_url = Service.image_url
+    to_dict = Service.to_dict
+
+
+# Ids por SELECT ... IN de categorias, o mesmo lote do selectinload; mantém a
+# quantidade de parâmetros abaixo dos limites do SQLite e do PostgreSQL
+CATEGORY_BATCH_SIZE = 500
+
+
+def service_rows_query(fields=None, extra_columns=(), with_versions=False):
+    """Consulta de colunas (não de entidades) com o necessário para 'fields'.
+
+    Aceita os mesmos filtros, ordenação e paginação de Service.query; cada linha
+    vira um ServiceDTO em service_dtos(). Com 'with_versions', as linhas trazem
+    também 'service_version' (e 'owner_version', se houver userEntity), os
+    updated_at que compõem o ETag de uma página.
+    """
+    fields = SERVICE_FIELDS if fields is None else fields
+    names = {'id'}.union(*(SERVICE_FIELDS[field][0] for field in fields))
+    columns = [getattr(Service, name) for name in sorted(names)]
+    columns += [column for column in extra_columns if column.key not in names]
+    query = db.session.query(*columns)
+    if with_versions:
+        query = query.add_columns(Service.updated_at.label('service_version'))
+    if 'userEntity' in fields:
+        query = (query.join(User, User.id == Service.user_id)
+                 .add_columns(User.name.label('user_name'), User.email.label('user_email')))
+        if with_versions:
+            query = query.add_columns(User.updated_at.label('owner_version'))
+    return query
+
+
+def service_dtos(rows, fields=None):
+    """Converte as linhas de service_rows_query() em ServiceDTOs.
+
+    As categorias vêm em um SELECT ... IN por lote de CATEGORY_BATCH_SIZE serviços
+    (um só nas páginas comuns), como o selectinload do ORM.
+    """
+    fields = SERVICE_FIELDS if fields is None else fields
+    if not rows:
+        return []
+    # Posição de cada coluna na linha, calculada uma vez para todas as linhas
+    keys = rows[0]._fields
+    columns = [(index, name) for index, name in enumerate(keys) if name in ServiceDTO.__slots__]
+    with_user = 'userEntity' in fields
+    with_categories = 'categoryEntities' in fields
+    if with_user:
+        user_index = (keys.index('user_id'), keys.index('user_name'), keys.index('user_email'))
+
+    services = []
+    for row in rows:
+        service = ServiceDTO()
+        for index, name in columns:
+            setattr(service, name, row[index])
+        if with_user:
+            service.user_entity = UserDTO(row[user_index[0]], row[user_index[1]], row[user_index[2]])
+        if with_categories:
+            service.categories = []
+        services.append(service)
+
+    if with_categories:
+        by_id = {service.id: service for service in services}
+        ids = list(by_id)
+        for start in range(0, len(ids), CATEGORY_BATCH_SIZE):
+            category_rows = db.session.execute(
+                db.select(service_categories.c.service_id, Category.id, Category.name)
+                .join(Category, Category.id == service_categories.c.category_id)
+                .where(service_categories.c.service_id.in_(ids[start:start + CATEGORY_BATCH_SIZE]))
+            )
+            for service_id, category_id, name in category_rows:
+                by_id[service_id].categories.append(CategoryDTO(category_id, name))
+    return services
@@ -3,20 +3,12 @@ document.addEventListener("DOMContentLoaded", function () {
     const token = localStorage.getItem("auth_token");
     if (!token) { window.location.href = "/"; return; }
 
-    // Carregar saldo atual
-    async function loadBalance() {
-        try {
-            const res = await fetch("/user/get", { headers: { "Authorization": "Bearer " + token } });
-            if (res.ok) {
-                const user = await res.json();
-                document.querySelectorAll(".qty-chronos-text").forEach(el => el.textContent = user.timeChronos ?? 0);
-                localStorage.setItem("user_chronos", user.timeChronos ?? 0);
-                const amountInput = document.getElementById("input-chronos-amount");
-                if (amountInput) amountInput.max = Math.max(0, 300 - (user.timeChronos || 0));
-            }
-        } catch (e) { console.error(e); }
-    }
-    loadBalance();
+    // Saldo atual, atualizado em tempo real
+    acompanharSaldo(token, function (saldo) {
+        document.querySelectorAll(".qty-chronos-text").forEach(el => el.textContent = saldo);
+        const amountInput = document.getElementById("input-chronos-amount");
+        if (amountInput) amountInput.max = Math.max(0, 300 - saldo);
+    });
 
     // Cálculo em tempo real
     const amountInput = document.getElementById("input-chronos-amount");
@@ -0,0 +1,41 @@
+// CategorySuggestions.js
+// Sugestões de categorias existentes (GET /category/suggest, das mais usadas) em
+// um <datalist> enquanto o usuário digita no campo ligado a ele. Usado pelo filtro
+// da página inicial e pelos formulários de criação e edição de serviço.
+const SUGESTOES_CATEGORIA_LIMITE = 10;
+const SUGESTOES_CATEGORIA_ESPERA = 150;  // ms sem digitar antes de consultar
+
+function ligarSugestoesCategorias(input, datalist) {
+    if (!input || !datalist) return;
+    let timeoutId;
+    let consulta = 0;  // Descarta respostas que chegam depois de uma consulta mais nova
+
+    async function sugerir(prefixo) {
+        const token = localStorage.getItem("auth_token");
+        if (!token) return;
+        const atual = ++consulta;
+        try {
+            const params = new URLSearchParams({ prefix: prefixo.trim(), limit: SUGESTOES_CATEGORIA_LIMITE });
+            const response = await fetch(`/category/suggest?${params}`, {
+                headers: { "Authorization": "Bearer " + token }
+            });
+            if (!response.ok) return;
+            const categorias = await response.json();
+            if (atual !== consulta) return;
+            datalist.innerHTML = "";
+            categorias.forEach(categoria => {
+                const option = document.createElement("option");
+                option.value = categoria.name;
+                datalist.appendChild(option);
+            });
+        } catch (error) {
+            console.error("Erro ao buscar sugestões de categoria:", error);
+        }
+    }
+
+    input.addEventListener("input", function () {
+        clearTimeout(timeoutId);
+        timeoutId = setTimeout(() => sugerir(this.value), SUGESTOES_CATEGORIA_ESPERA);
+    });
+    input.addEventListener("focus", function () { sugerir(this.value); });
+}
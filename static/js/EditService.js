@@ -9,20 +9,12 @@ document.addEventListener("DOMContentLoaded", async function () {
     // Link de cancelar aponta para o serviço
     document.getElementById("btn-cancel").href = `/view_service?id=${serviceId}`;
 
-    // Carregar saldo
-    async function loadBalance() {
-        try {
-            const res = await fetch("/user/get", { headers: { "Authorization": "Bearer " + token } });
-            if (res.ok) {
-                const user = await res.json();
-                document.querySelectorAll(".qty-chronos-text").forEach(el => el.textContent = user.timeChronos ?? 0);
-            }
-        } catch (e) { console.error(e); }
-    }
-    loadBalance();
+    // Saldo, atualizado em tempo real
+    acompanharSaldo(token, function (saldo) {
+        document.querySelectorAll(".qty-chronos-text").forEach(el => el.textContent = saldo);
+    });
 
     // Carregar dados do serviço
-    let originalImageBase64 = null;
     try {
         const res = await fetch(`/service/get/${serviceId}`, {
             headers: { "Authorization": "Bearer " + token }
@@ -44,8 +36,6 @@ document.addEventListener("DOMContentLoaded", async function () {
             tag.innerHTML = `${cat.name}<span class="remove-tag" onclick="this.parentElement.remove()">×</span>`;
             tagList.appendChild(tag);
         });
-
-        originalImageBase64 = data.serviceImage;
     } catch (err) {
         alert("Erro ao carregar serviço.");
         window.location.href = "/home";
@@ -78,6 +68,9 @@ document.addEventListener("DOMContentLoaded", async function () {
         });
     }
 
+    // Sugestões de categorias existentes (das mais usadas) enquanto digita
+    ligarSugestoesCategorias(categoryInput, document.getElementById('category-suggestions'));
+
     // Envio do formulário
     document.getElementById("register-form").addEventListener("submit", async function (e) {
         e.preventDefault();
@@ -93,7 +86,7 @@ document.addEventListener("DOMContentLoaded", async function () {
             return;
         }
 
-        // Imagem: usa a nova se selecionada, senão mantém a original
+        // Imagem: envia a nova se selecionada; sem imagem o servidor mantém a original
         let serviceImageBase64 = null;
         const file = imageInput?.files[0];
         if (file) {
@@ -101,8 +94,6 @@ document.addEventListener("DOMContentLoaded", async function () {
             reader.readAsDataURL(file);
             await new Promise(resolve => reader.onload = resolve);
             serviceImageBase64 = reader.result;
-        } else {
-            serviceImageBase64 = originalImageBase64 ? `data:image/png;base64,${originalImageBase64}` : null;
         }
 
         // Categorias
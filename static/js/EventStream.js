@@ -0,0 +1,80 @@
+// EventStream.js
+// Leitor dos feeds SSE do servidor usando fetch: o EventSource do navegador não
+// envia o cabeçalho Authorization exigido pelas rotas com JWT. Reconecta sozinho
+// após uma queda ou o fim do feed (o servidor encerra quando o token expira) e
+// para quando o token deixa de ser aceito (401).
+function abrirFeedEventos(url, token, aoReceber) {
+    const controle = new AbortController();
+    let espera = 5000;  // Atualizada pelo campo "retry" do servidor
+
+    function processarBloco(bloco) {
+        let evento = "message";
+        const dados = [];
+        bloco.split("\n").forEach(linha => {
+            if (!linha || linha.startsWith(":")) return;  // Comentário (ping)
+            const separador = linha.indexOf(":");
+            const campo = separador >= 0 ? linha.slice(0, separador) : linha;
+            let valor = separador >= 0 ? linha.slice(separador + 1) : "";
+            if (valor.startsWith(" ")) valor = valor.slice(1);
+            if (campo === "event") evento = valor;
+            else if (campo === "data") dados.push(valor);
+            else if (campo === "retry" && /^\d+$/.test(valor)) espera = Number(valor);
+        });
+        if (!dados.length) return;
+        try {
+            aoReceber(evento, JSON.parse(dados.join("\n")));
+        } catch (error) {
+            console.error("Erro ao processar evento:", error);
+        }
+    }
+
+    async function lerEventos(corpo) {
+        const leitor = corpo.pipeThrough(new TextDecoderStream()).getReader();
+        let buffer = "";
+        while (true) {
+            const { value, done } = await leitor.read();
+            if (done) return;
+            buffer += value;
+            let fim;
+            while ((fim = buffer.indexOf("\n\n")) >= 0) {
+                processarBloco(buffer.slice(0, fim));
+                buffer = buffer.slice(fim + 2);
+            }
+        }
+    }
+
+    async function conectar() {
+        while (!controle.signal.aborted) {
+            try {
+                const response = await fetch(url, {
+                    headers: { "Authorization": "Bearer " + token, "Accept": "text/event-stream" },
+                    signal: controle.signal
+                });
+                if (response.status === 401) return;
+                if (!response.ok || !response.body) throw new Error(`Erro HTTP: ${response.status}`);
+                await lerEventos(response.body);
+            } catch (error) {
+                if (controle.signal.aborted) return;
+                console.error("Feed de eventos interrompido:", error);
+            }
+            await new Promise(resolve => setTimeout(resolve, espera));
+        }
+    }
+
+    conectar();
+    // Função que encerra o feed
+    return () => controle.abort();
+}
+
+// Saldo de Chronos do usuário logado (GET /user/stream). Mostra na hora o último
+// saldo conhecido (localStorage) e depois o do servidor, que chega ao conectar e
+// a cada compra, venda ou transferência, sem novas leituras de /user/get.
+function acompanharSaldo(token, aoAtualizar) {
+    const salvo = localStorage.getItem("user_chronos");
+    if (salvo !== null) aoAtualizar(Number(salvo));
+    return abrirFeedEventos("/user/stream", token, function (evento, dados) {
+        if (evento !== "balance") return;
+        localStorage.setItem("user_chronos", dados.timeChronos);
+        aoAtualizar(dados.timeChronos);
+    });
+}
@@ -2,28 +2,15 @@
 document.addEventListener("DOMContentLoaded", function () {
     const token = localStorage.getItem("auth_token");
 
-    // ----- CARREGAR SALDO DO USUÁRIO -----
-    async function loadUserChronos() {
-        if (!token) return;
-        try {
-            const response = await fetch("/user/get", {
-                headers: { "Authorization": "Bearer " + token }
+    // ----- SALDO DO USUÁRIO (atualizado em tempo real) -----
+    if (token) {
+        acompanharSaldo(token, function (saldo) {
+            document.querySelectorAll(".qty-chronos-text").forEach(el => {
+                el.textContent = saldo;
             });
-            if (response.ok) {
-                const user = await response.json();
-                const saldo = user.timeChronos ?? 0;
-                document.querySelectorAll(".qty-chronos-text").forEach(el => {
-                    el.textContent = saldo;
-                });
-                document.getElementById("modal-chronos-value").textContent = saldo;
-                localStorage.setItem("user_chronos", saldo);
-                localStorage.setItem("user_name", user.name || "");
-            }
-        } catch (e) {
-            console.error("Erro ao carregar Chronos:", e);
-        }
+            document.getElementById("modal-chronos-value").textContent = saldo;
+        });
     }
-    loadUserChronos();
 
     // ----- SIDE DRAWER -----
     const drawer = document.getElementById("side-drawer");
@@ -91,7 +78,7 @@ document.addEventListener("DOMContentLoaded", function () {
                 const [min, max] = selectTempo.value.split("-").map(Number);
                 tempoAtual = { min, max };
             }
-            aplicarFiltrosCombinados();
+            recarregarServicos();
         }
         selectTempo.addEventListener("change", atualizarTempoPorSelect);
         const [min, max] = selectTempo.value.split("-").map(Number);
@@ -103,7 +90,7 @@ document.addEventListener("DOMContentLoaded", function () {
     if (selectModalidade) {
         selectModalidade.addEventListener("change", function () {
             modalidadeAtual = this.value;
-            aplicarFiltrosCombinados();
+            recarregarServicos();
         });
     }
 
@@ -114,6 +101,9 @@ document.addEventListener("DOMContentLoaded", function () {
     const btnLimparTempo = document.getElementById("btn-limpar-tempo");
     const tempoSelecionadoDiv = document.getElementById("tempo-selecionado");
 
+    // Serviços por faixa de 5 chronos (limite superior -> quantidade), vindos de /service/facets
+    let contagensTempo = {};
+
     function updateTooltip() {
         if (!slider || !tooltip) return;
         const val = parseInt(slider.value);
@@ -121,7 +111,8 @@ document.addEventListener("DOMContentLoaded", function () {
         const max = parseInt(slider.max);
         let minTempo = val === 5 ? 0 : val - 5;
         let maxTempo = val;
-        tooltip.textContent = `${minTempo}-${maxTempo}`;
+        const contagem = contagensTempo[maxTempo];
+        tooltip.textContent = contagem === undefined ? `${minTempo}-${maxTempo}` : `${minTempo}-${maxTempo} (${contagem})`;
         const sliderWidth = slider.offsetWidth;
         const thumbWidth = 16;
         const percent = (val - min) / (max - min);
@@ -164,7 +155,7 @@ document.addEventListener("DOMContentLoaded", function () {
             if (tempoSelecionadoDiv) { tempoSelecionadoDiv.textContent = `Filtrando por: ${intervalo.min}-${intervalo.max} chronos`; tempoSelecionadoDiv.classList.add("ativa"); }
         }
         atualizarBotaoLimparTempo();
-        aplicarFiltrosCombinados();
+        recarregarServicos();
     }
 
     if (slider && tooltip) {
@@ -197,7 +188,7 @@ document.addEventListener("DOMContentLoaded", function () {
             if (categoriaSelecionadaDiv) { categoriaSelecionadaDiv.textContent = `Filtrando por: ${categoriaNome}`; categoriaSelecionadaDiv.classList.add("ativa"); }
         }
         atualizarBotaoLimpar();
-        aplicarFiltrosCombinados();
+        recarregarServicos();
     }
 
     if (inputCategoria) {
@@ -208,6 +199,9 @@ document.addEventListener("DOMContentLoaded", function () {
             atualizarBotaoLimpar();
             if (this.value.trim() === "" && categoriaAtual) filtrarPorCategoria("");
         });
+        // Sugestões vêm do servidor (todas as categorias, das mais usadas), não só
+        // das categorias dos serviços já carregados
+        ligarSugestoesCategorias(inputCategoria, document.getElementById("categorias-lista"));
         inputCategoria.addEventListener("change", function () {
             const cat = inputCategoria.value.trim();
             if (cat) setTimeout(() => filtrarPorCategoria(cat), 100);
@@ -226,24 +220,28 @@ document.addEventListener("DOMContentLoaded", function () {
     // ----- ORDENAÇÃO -----
     const selectOrdenacao = document.getElementById("filtro-ordenacao");
 
+    // Opções ordenadas pelo servidor (índices compostos + cursor); "1" é a ordem
+    // padrão (criação) e "2" (avaliação) ainda é ordenada no navegador.
+    const ORDENACAO_SERVIDOR = {
+        "0": "newest",
+        "3": "chronos_desc",
+        "4": "chronos_asc",
+        "5": "deadline_asc",
+        "6": "deadline_desc"
+    };
+
     function ordenarServicos(servicos, opcao) {
         const s = [...servicos];
-        switch (opcao) {
-            case "0": return s;
-            case "1": return s.reverse();
-            case "2": return s.sort((a, b) => (b.rating || 0) - (a.rating || 0));
-            case "3": return s.sort((a, b) => (b.timeChronos || 0) - (a.timeChronos || 0));
-            case "4": return s.sort((a, b) => (a.timeChronos || 0) - (b.timeChronos || 0));
-            case "5": return s.sort((a, b) => new Date(a.deadline || "9999-12-31") - new Date(b.deadline || "9999-12-31"));
-            case "6": return s.sort((a, b) => new Date(b.deadline || "0000-01-01") - new Date(a.deadline || "0000-01-01"));
-            default: return s;
-        }
+        if (opcao === "2") return s.sort((a, b) => (b.rating || 0) - (a.rating || 0));
+        return s;
     }
 
     if (selectOrdenacao) {
         selectOrdenacao.addEventListener("change", function () {
-            if (servicosFiltrados.length > 0) {
-                exibirServicos(ordenarServicos(servicosFiltrados, this.value));
+            if (this.value === "2") {
+                aplicarFiltrosCombinados();
+            } else {
+                recarregarServicos();
             }
         });
     }
@@ -251,24 +249,9 @@ document.addEventListener("DOMContentLoaded", function () {
     // ----- PESQUISA -----
     const inputSearchBar = document.getElementById("input-search-bar");
 
+    // A busca roda no servidor (índice full-text), junto com os demais filtros
     function filtrarServicosPorTermo(termo) {
-        if (!termo || termo.trim() === "") { aplicarFiltrosCombinados(); return; }
-        const termoLC = termo.toLowerCase().trim();
-        let lista = [...todosServicos];
-        if (categoriaAtual) {
-            lista = lista.filter(s => s.categoryEntities?.some(c => c.name?.toLowerCase().includes(categoriaAtual.toLowerCase())));
-        }
-        if (tempoAtual) {
-            lista = lista.filter(s => (s.timeChronos || 0) >= tempoAtual.min && (s.timeChronos || 0) <= tempoAtual.max);
-        }
-        if (modalidadeAtual) {
-            lista = lista.filter(s => s.modality === modalidadeAtual);
-        }
-        servicosFiltrados = lista.filter(s => (s.title || "").toLowerCase().includes(termoLC) || (s.description || "").toLowerCase().includes(termoLC));
-        if (selectOrdenacao && selectOrdenacao.value !== "0") {
-            servicosFiltrados = ordenarServicos(servicosFiltrados, selectOrdenacao.value);
-        }
-        exibirServicos(servicosFiltrados);
+        recarregarServicos();
     }
 
     if (inputSearchBar) {
@@ -285,27 +268,15 @@ document.addEventListener("DOMContentLoaded", function () {
     }
 
     // ----- FILTROS COMBINADOS -----
+    // Filtro que ainda roda no navegador (avaliação) sobre a lista já filtrada
+    // pelo servidor.
     function aplicarFiltrosCombinados() {
         let lista = [...todosServicos];
-        if (categoriaAtual) {
-            lista = lista.filter(s => s.categoryEntities?.some(c => c.name?.toLowerCase().includes(categoriaAtual.toLowerCase())));
-        }
-        if (tempoAtual) {
-            lista = lista.filter(s => (s.timeChronos || 0) >= tempoAtual.min && (s.timeChronos || 0) <= tempoAtual.max);
-        }
-        if (modalidadeAtual) {
-            lista = lista.filter(s => s.modality === modalidadeAtual);
-        }
         if (avaliacaoAtual) {
             lista = lista.filter(s => (s.userEntity?.rating || s.rating || 4.9) >= avaliacaoAtual);
         }
-        const termoBusca = inputSearchBar?.value;
-        if (termoBusca && termoBusca.trim() !== "") {
-            const termoLC = termoBusca.toLowerCase().trim();
-            lista = lista.filter(s => (s.title || "").toLowerCase().includes(termoLC) || (s.description || "").toLowerCase().includes(termoLC));
-        }
         servicosFiltrados = lista;
-        if (selectOrdenacao && selectOrdenacao.value !== "0") {
+        if (selectOrdenacao) {
             servicosFiltrados = ordenarServicos(servicosFiltrados, selectOrdenacao.value);
         }
         exibirServicos(servicosFiltrados);
@@ -314,23 +285,6 @@ document.addEventListener("DOMContentLoaded", function () {
     // ----- EXIBIÇÃO DE SERVIÇOS -----
     const requestsContainer = document.getElementById("requests");
 
-    function extrairCategoriasUnicas(servicos) {
-        const cats = new Set();
-        servicos.forEach(s => s.categoryEntities?.forEach(c => { if (c.name) cats.add(c.name); }));
-        return Array.from(cats).sort();
-    }
-
-    function popularCategoriasDatalist(servicos) {
-        const datalist = document.getElementById("categorias-lista");
-        if (!datalist) return;
-        datalist.innerHTML = "";
-        extrairCategoriasUnicas(servicos).forEach(cat => {
-            const opt = document.createElement("option");
-            opt.value = cat;
-            datalist.appendChild(opt);
-        });
-    }
-
     function formatarData(dateStr) {
         if (!dateStr) return null;
         const d = new Date(dateStr + "T00:00:00");
@@ -361,67 +315,7 @@ document.addEventListener("DOMContentLoaded", function () {
         requestsContainer.style.gridTemplateColumns = "repeat(4, 1fr)";
         requestsContainer.style.gap = "20px";
 
-        servicos.forEach(servico => {
-            const card = document.createElement("div");
-            card.className = "service-card";
-            card.style.width = "100%";
-            card.style.cursor = "pointer";
-
-            let imageSrc = "/static/img/default-service.png";
-            if (servico.serviceImage && typeof servico.serviceImage === "string") {
-                imageSrc = `data:image/png;base64,${servico.serviceImage}`;
-            }
-
-            const titulo = servico.title || "Sem título";
-            const tituloLimitado = titulo.length > 25 ? titulo.substring(0, 25) + "..." : titulo;
-            const descricao = servico.description || "";
-            const descricaoLimitada = descricao.length > 60 ? descricao.substring(0, 60) + "..." : descricao;
-            const tempoServico = servico.timeChronos || 0;
-            let classeTempoDestaque = "";
-            if (tempoAtual && tempoServico >= tempoAtual.min && tempoServico <= tempoAtual.max) {
-                classeTempoDestaque = " tempo-destaque";
-            }
-
-            let categoriasHTML = "";
-            if (servico.categoryEntities && servico.categoryEntities.length > 0) {
-                categoriasHTML = servico.categoryEntities.slice(0, 3).map(cat => {
-                    const nome = cat.name || "Categoria";
-                    let classeExtra = "";
-                    if (categoriaAtual && nome.toLowerCase().includes(categoriaAtual.toLowerCase())) classeExtra = " categoria-destaque";
-                    const nomeExibicao = nome.substring(0, 12) + (nome.length > 12 ? "..." : "");
-                    return `<div class="category-service${classeExtra}" title="${nome}"><img class="category-service-img" src="/static/img/Paintbrush.png" alt=""><p class="category-service-text">${nomeExibicao}</p></div>`;
-                }).join("");
-            } else {
-                categoriasHTML = '<div class="category-service"><p class="category-service-text">Sem categorias</p></div>';
-            }
-
-            const prazoStr = servico.deadline ? `<p class="service-deadline">Prazo: ${formatarData(servico.deadline)}</p>` : "";
-            const modalidadeStr = servico.modality ? `<span class="badge-modality badge-${servico.modality.toLowerCase().replace('í','i')}">${servico.modality}</span>` : "";
-
-            card.innerHTML = `
-                <img src="${imageSrc}" alt="Imagem do Serviço" class="service-image">
-                <div class="service-info">
-                    <p class="service-title" title="${servico.title || ""}">${tituloLimitado}</p>
-                    <p class="user-service" title="Postado por ${servico.userEntity?.name || 'Usuário desconhecido'}">
-                        Postado por ${servico.userEntity?.name || "Usuário desconhecido"}
-                    </p>
-                    <p class="service-description" title="${descricao}">${descricaoLimitada}</p>
-                    ${prazoStr}
-                    ${modalidadeStr}
-                    <div class="qty-chronos-service${classeTempoDestaque}">
-                        <img class="qty-chronos-service-img" src="/static/img/Coin.png" alt="">
-                        <p class="qty-chronos-service-text">${tempoServico} chronos</p>
-                    </div>
-                    <div class="categories-service">${categoriasHTML}</div>
-                </div>
-            `;
-
-            card.addEventListener("click", function () {
-                window.location.href = `/view_service?id=${servico.id}`;
-            });
-
-            requestsContainer.appendChild(card);
-        });
+        servicos.forEach(servico => requestsContainer.appendChild(criarCardServico(servico)));
 
         const cardsRestantes = 4 - (servicos.length % 4);
         if (cardsRestantes > 0 && cardsRestantes < 4) {
@@ -434,6 +328,66 @@ document.addEventListener("DOMContentLoaded", function () {
         }
     }
 
+    function criarCardServico(servico) {
+        const card = document.createElement("div");
+        card.className = "service-card";
+        card.dataset.id = servico.id;
+        card.style.width = "100%";
+        card.style.cursor = "pointer";
+
+        const imageSrc = servico.serviceImageUrl || "/static/img/default-service.png";
+
+        const titulo = servico.title || "Sem título";
+        const tituloLimitado = titulo.length > 25 ? titulo.substring(0, 25) + "..." : titulo;
+        const descricao = servico.description || "";
+        const descricaoLimitada = descricao.length > 60 ? descricao.substring(0, 60) + "..." : descricao;
+        const tempoServico = servico.timeChronos || 0;
+        let classeTempoDestaque = "";
+        if (tempoAtual && tempoServico >= tempoAtual.min && tempoServico <= tempoAtual.max) {
+            classeTempoDestaque = " tempo-destaque";
+        }
+
+        let categoriasHTML = "";
+        if (servico.categoryEntities && servico.categoryEntities.length > 0) {
+            categoriasHTML = servico.categoryEntities.slice(0, 3).map(cat => {
+                const nome = cat.name || "Categoria";
+                let classeExtra = "";
+                if (categoriaAtual && nome.toLowerCase().includes(categoriaAtual.toLowerCase())) classeExtra = " categoria-destaque";
+                const nomeExibicao = nome.substring(0, 12) + (nome.length > 12 ? "..." : "");
+                return `<div class="category-service${classeExtra}" title="${nome}"><img class="category-service-img" src="/static/img/Paintbrush.png" alt=""><p class="category-service-text">${nomeExibicao}</p></div>`;
+            }).join("");
+        } else {
+            categoriasHTML = '<div class="category-service"><p class="category-service-text">Sem categorias</p></div>';
+        }
+
+        const prazoStr = servico.deadline ? `<p class="service-deadline">Prazo: ${formatarData(servico.deadline)}</p>` : "";
+        const modalidadeStr = servico.modality ? `<span class="badge-modality badge-${servico.modality.toLowerCase().replace('í','i')}">${servico.modality}</span>` : "";
+
+        card.innerHTML = `
+            <img src="${imageSrc}" alt="Imagem do Serviço" class="service-image" loading="lazy">
+            <div class="service-info">
+                <p class="service-title" title="${servico.title || ""}">${tituloLimitado}</p>
+                <p class="user-service" title="Postado por ${servico.userEntity?.name || 'Usuário desconhecido'}">
+                    Postado por ${servico.userEntity?.name || "Usuário desconhecido"}
+                </p>
+                <p class="service-description" title="${descricao}">${descricaoLimitada}</p>
+                ${prazoStr}
+                ${modalidadeStr}
+                <div class="qty-chronos-service${classeTempoDestaque}">
+                    <img class="qty-chronos-service-img" src="/static/img/Coin.png" alt="">
+                    <p class="qty-chronos-service-text">${tempoServico} chronos</p>
+                </div>
+                <div class="categories-service">${categoriasHTML}</div>
+            </div>
+        `;
+
+        card.addEventListener("click", function () {
+            window.location.href = `/view_service?id=${servico.id}`;
+        });
+
+        return card;
+    }
+
     // ----- FETCH DE SERVIÇOS -----
     if (!requestsContainer) { console.error("Elemento #requests não encontrado."); return; }
 
@@ -442,41 +396,254 @@ document.addEventListener("DOMContentLoaded", function () {
         return;
     }
 
-    fetch("/service/get/all", {
-        method: "GET",
-        headers: { "Authorization": "Bearer " + token, "Content-Type": "application/json" }
-    })
-    .then(async response => {
+    // Os serviços chegam em páginas (cursor keyset), já filtrados por categoria,
+    // tempo e modalidade e ordenados pelo servidor. A primeira página é exibida
+    // assim que chega; as seguintes só são buscadas quando o usuário rola até
+    // perto do fim da lista (sentinela observada por IntersectionObserver).
+    const TAMANHO_PAGINA = 50;
+    let geracaoCarga = 0;
+
+    function construirFiltrosServidor() {
+        const params = new URLSearchParams({ limit: TAMANHO_PAGINA });
+        if (categoriaAtual) params.set("category", categoriaAtual);
+        if (tempoAtual) {
+            params.set("min_chronos", tempoAtual.min);
+            params.set("max_chronos", tempoAtual.max);
+        }
+        if (modalidadeAtual) params.set("modality", modalidadeAtual);
+        const ordenacao = selectOrdenacao ? ORDENACAO_SERVIDOR[selectOrdenacao.value] : null;
+        if (ordenacao) params.set("sort", ordenacao);
+        return params;
+    }
+
+    async function buscarPaginaServicos(cursor) {
+        const params = construirFiltrosServidor();
+        if (cursor) params.set("cursor", cursor);
+        // Com termo de busca, uma única página ordenada por relevância
+        const termoBusca = inputSearchBar?.value.trim();
+        let url = `/service/get/all?${params}`;
+        if (termoBusca) {
+            params.set("q", termoBusca);
+            params.set("limit", 100);
+            url = `/service/search?${params}`;
+        }
+        const response = await fetch(url, {
+            method: "GET",
+            headers: { "Authorization": "Bearer " + token, "Content-Type": "application/json" }
+        });
         if (!response.ok) {
             if (response.status === 401) {
                 alert("Sessão expirada. Faça login novamente.");
                 localStorage.removeItem("auth_token");
                 localStorage.removeItem("user_id");
                 window.location.href = "/";
-                return;
+                return null;
             }
             throw new Error(`Erro HTTP: ${response.status}`);
         }
         return response.json();
-    })
-    .then(servicos => {
-        if (!servicos || servicos.length === 0) { exibirServicos([]); return; }
-        todosServicos = servicos;
-        servicosFiltrados = [...servicos];
-        popularCategoriasDatalist(servicos);
-        atualizarBotaoLimpar();
-        atualizarBotaoLimparTempo();
-        if (selectOrdenacao && selectOrdenacao.value !== "0") {
-            servicosFiltrados = ordenarServicos(servicosFiltrados, selectOrdenacao.value);
+    }
+
+    let proximoCursor = null;
+    let carregandoPagina = false;
+    let sentinelaVisivel = false;
+
+    async function carregarServicos() {
+        // Uma mudança de filtro inicia nova carga; páginas da carga anterior são descartadas
+        const geracao = ++geracaoCarga;
+        esconderAvisoNovos();
+        proximoCursor = null;
+        carregandoPagina = true;
+        try {
+            const pagina = await buscarPaginaServicos(null);
+            if (!pagina || geracao !== geracaoCarga) return;
+
+            todosServicos = pagina.items;
+            proximoCursor = pagina.next_cursor || null;
+            atualizarBotaoLimpar();
+            atualizarBotaoLimparTempo();
+            aplicarFiltrosCombinados();
+        } finally {
+            if (geracao === geracaoCarga) carregandoPagina = false;
         }
-        if (inputSearchBar && inputSearchBar.value.trim() !== "") {
-            setTimeout(() => filtrarServicosPorTermo(inputSearchBar.value), 100);
-        } else {
-            exibirServicos(servicosFiltrados);
+        // A primeira página pode não preencher a tela: a sentinela continua visível
+        if (sentinelaVisivel) carregarProximaPagina();
+    }
+
+    async function carregarProximaPagina() {
+        if (!proximoCursor || carregandoPagina) return;
+        const geracao = geracaoCarga;
+        carregandoPagina = true;
+        try {
+            const pagina = await buscarPaginaServicos(proximoCursor);
+            if (!pagina || geracao !== geracaoCarga) return;
+            todosServicos = todosServicos.concat(pagina.items);
+            proximoCursor = pagina.next_cursor || null;
+            aplicarFiltrosCombinados();
+        } catch (error) {
+            console.error("Erro ao carregar mais serviços:", error);
+            return;
+        } finally {
+            if (geracao === geracaoCarga) carregandoPagina = false;
+        }
+        if (sentinelaVisivel && geracao === geracaoCarga) carregarProximaPagina();
+    }
+
+    const sentinela = document.createElement("div");
+    sentinela.id = "requests-sentinela";
+    requestsContainer.after(sentinela);
+    new IntersectionObserver(function (entradas) {
+        sentinelaVisivel = entradas[0].isIntersecting;
+        if (sentinelaVisivel) carregarProximaPagina();
+    }, { rootMargin: "600px 0px" }).observe(sentinela);
+
+    // Aviso de serviços criados depois da carga (ver o feed de eventos abaixo)
+    const avisoNovos = document.createElement("button");
+    avisoNovos.type = "button";
+    avisoNovos.className = "new-services-notice";
+    avisoNovos.hidden = true;
+    requestsContainer.before(avisoNovos);
+    let novosServicos = 0;
+
+    function mostrarAvisoNovos(quantidade) {
+        novosServicos += quantidade;
+        avisoNovos.textContent = novosServicos > 0
+            ? `${novosServicos} ${novosServicos === 1 ? "novo serviço" : "novos serviços"} - clique para atualizar`
+            : "A lista pode estar desatualizada - clique para atualizar";
+        avisoNovos.hidden = false;
+    }
+
+    function esconderAvisoNovos() {
+        novosServicos = 0;
+        avisoNovos.hidden = true;
+    }
+
+    avisoNovos.addEventListener("click", function () {
+        esconderAvisoNovos();
+        recarregarServicos();
+        requestsContainer.scrollIntoView({ behavior: "smooth" });
+    });
+
+    // As opções do select de tempo agrupam faixas de 5 ("6-25" = faixas 10 a 25)
+    function atualizarContagensSelectTempo(faixas) {
+        if (!selectTempo) return;
+        Array.from(selectTempo.options).forEach(opt => {
+            if (!opt.value) return;
+            if (!opt.dataset.rotulo) opt.dataset.rotulo = opt.textContent;
+            const [min, max] = opt.value.split("-").map(Number);
+            const total = faixas
+                .filter(faixa => faixa.max >= min && faixa.max <= max)
+                .reduce((soma, faixa) => soma + faixa.count, 0);
+            opt.textContent = `${opt.dataset.rotulo} (${total})`;
+        });
+    }
+
+    // Contagens das facetas para os filtros atuais (o servidor ignora o filtro
+    // de tempo nas contagens por faixa, então o slider mostra todas as faixas)
+    async function carregarFacetas() {
+        const params = construirFiltrosServidor();
+        params.delete("limit");
+        params.delete("sort");
+        const termoBusca = inputSearchBar?.value.trim();
+        if (termoBusca) params.set("q", termoBusca);
+        try {
+            const response = await fetch(`/service/facets?${params}`, {
+                headers: { "Authorization": "Bearer " + token }
+            });
+            if (!response.ok) return;
+            const facetas = await response.json();
+            contagensTempo = {};
+            facetas.chronos.forEach(faixa => { contagensTempo[faixa.max] = faixa.count; });
+            updateTooltip();
+            atualizarContagensSelectTempo(facetas.chronos);
+        } catch (error) {
+            console.error("Erro ao carregar facetas:", error);
+        }
+    }
+
+    function recarregarServicos() {
+        carregarFacetas();
+        carregarServicos().catch(error => {
+            console.error("Erro ao carregar serviços:", error);
+            exibirServicos([]);
+        });
+    }
+
+    recarregarServicos();
+
+    // Atualizações em tempo real (GET /service/stream), sem polling e sem
+    // recarregar a lista (o que voltaria à primeira página e perderia a rolagem):
+    // um serviço excluído sai da lista na hora; os editados que já estão na tela
+    // são relidos em lote (/service/get/batch) uma vez por rajada de eventos e
+    // trocados no lugar; serviços criados só acendem o aviso, e a lista é
+    // recarregada quando o usuário clica nele.
+    const TAMANHO_LOTE = 100;  // MAX_BATCH_SIZE do servidor
+    const servicosAlterados = new Set();
+    let atualizacaoAgendada = null;
+
+    function agendarAtualizacao(ids) {
+        // Só interessam os serviços já carregados; os demais chegam atualizados com a próxima página
+        const carregados = new Set(todosServicos.map(servico => servico.id));
+        ids.filter(id => carregados.has(id)).forEach(id => servicosAlterados.add(id));
+        if (!servicosAlterados.size) return;
+        clearTimeout(atualizacaoAgendada);
+        atualizacaoAgendada = setTimeout(atualizarServicosAlterados, 1000);
+    }
+
+    async function buscarLoteServicos(ids) {
+        const response = await fetch(`/service/get/batch?ids=${ids.join(",")}`, {
+            headers: { "Authorization": "Bearer " + token }
+        });
+        if (!response.ok) throw new Error(`Erro HTTP: ${response.status}`);
+        return response.json();
+    }
+
+    async function atualizarServicosAlterados() {
+        const ids = [...servicosAlterados];
+        servicosAlterados.clear();
+        const geracao = geracaoCarga;
+        const atualizados = new Map();
+        const removidos = new Set();
+        try {
+            for (let inicio = 0; inicio < ids.length; inicio += TAMANHO_LOTE) {
+                const lote = await buscarLoteServicos(ids.slice(inicio, inicio + TAMANHO_LOTE));
+                lote.items.forEach(servico => atualizados.set(servico.id, servico));
+                lote.missing.forEach(id => removidos.add(id));
+            }
+        } catch (error) {
+            console.error("Erro ao atualizar serviços:", error);
+            return;
+        }
+        // A lista foi recarregada enquanto o lote chegava: já está atualizada
+        if (geracao !== geracaoCarga) return;
+
+        const trocar = servico => atualizados.get(servico.id) || servico;
+        todosServicos = todosServicos.filter(servico => !removidos.has(servico.id)).map(trocar);
+        if (removidos.size) {
+            aplicarFiltrosCombinados();
+            return;
+        }
+        // Só edições: cada card é trocado no lugar, sem redesenhar a lista
+        servicosFiltrados = servicosFiltrados.map(trocar);
+        atualizados.forEach((servico, id) => {
+            requestsContainer.querySelector(`.service-card[data-id="${id}"]`)?.replaceWith(criarCardServico(servico));
+        });
+    }
+
+    abrirFeedEventos("/service/stream", token, function (evento, dados) {
+        if (evento === "resync") {
+            // Eventos perdidos: relê tudo o que está na tela e avisa que pode haver novos
+            agendarAtualizacao(todosServicos.map(servico => servico.id));
+            mostrarAvisoNovos(0);
+        } else if (evento === "service" && dados.type === "deleted") {
+            servicosAlterados.delete(dados.id);
+            todosServicos = todosServicos.filter(servico => servico.id !== dados.id);
+            aplicarFiltrosCombinados();
+            carregarFacetas();
+        } else if (evento === "service" && dados.type === "created") {
+            mostrarAvisoNovos(1);
+        } else if (evento === "service") {
+            agendarAtualizacao([dados.id]);
         }
-    })
-    .catch(error => {
-        console.error("Erro ao carregar serviços:", error);
-        exibirServicos([]);
     });
 });
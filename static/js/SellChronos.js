@@ -5,22 +5,15 @@ document.addEventListener("DOMContentLoaded", function () {
 
     let currentBalance = 0;
 
-    async function loadBalance() {
-        try {
-            const res = await fetch("/user/get", { headers: { "Authorization": "Bearer " + token } });
-            if (res.ok) {
-                const user = await res.json();
-                currentBalance = user.timeChronos || 0;
-                document.querySelectorAll(".qty-chronos-text").forEach(el => el.textContent = currentBalance);
-                const saldoEl = document.getElementById("saldo-disponivel");
-                if (saldoEl) saldoEl.textContent = currentBalance;
-                const amountInput = document.getElementById("input-chronos-amount");
-                if (amountInput) amountInput.max = Math.max(0, currentBalance - 1);
-                localStorage.setItem("user_chronos", currentBalance);
-            }
-        } catch (e) { console.error(e); }
-    }
-    loadBalance();
+    // Saldo atual, atualizado em tempo real
+    acompanharSaldo(token, function (saldo) {
+        currentBalance = saldo;
+        document.querySelectorAll(".qty-chronos-text").forEach(el => el.textContent = currentBalance);
+        const saldoEl = document.getElementById("saldo-disponivel");
+        if (saldoEl) saldoEl.textContent = currentBalance;
+        const amountInput = document.getElementById("input-chronos-amount");
+        if (amountInput) amountInput.max = Math.max(0, currentBalance - 1);
+    });
 
     const amountInput = document.getElementById("input-chronos-amount");
     function updateCalc() {
@@ -258,6 +258,9 @@ document.addEventListener("DOMContentLoaded", function () {
         imageInput.click();
     });
 
+    // Sugestões de categorias existentes (das mais usadas) enquanto digita
+    ligarSugestoesCategorias(categoryInput, document.getElementById('category-suggestions'));
+
     // ----- TAG DE CATEGORIAS -----
     if (categoryInput && tagList) {
         categoryInput.addEventListener('keydown', function (e) {
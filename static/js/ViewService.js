@@ -4,18 +4,12 @@ document.addEventListener("DOMContentLoaded", function () {
     const serviceId = new URLSearchParams(window.location.search).get('id');
 
     // --- Saldo do usuário no header ---
-    async function loadUserChronos() {
-        if (!token) return;
-        try {
-            const res = await fetch("/user/get", { headers: { "Authorization": "Bearer " + token } });
-            if (res.ok) {
-                const user = await res.json();
-                const el = document.getElementById('user-chronos-display');
-                if (el) el.textContent = user.timeChronos ?? 0;
-            }
-        } catch (e) { console.error(e); }
+    if (token) {
+        acompanharSaldo(token, function (saldo) {
+            const el = document.getElementById('user-chronos-display');
+            if (el) el.textContent = saldo;
+        });
     }
-    loadUserChronos();
 
     // --- Carregar dados do serviço ---
     async function loadServiceData(id) {
@@ -54,8 +48,8 @@ document.addEventListener("DOMContentLoaded", function () {
 
         // Imagem
         const imgEl = document.getElementById('service-image');
-        if (imgEl && d.serviceImage) {
-            imgEl.src = `data:image/png;base64,${d.serviceImage}`;
+        if (imgEl && d.serviceImageUrl) {
+            imgEl.src = d.serviceImageUrl;
             imgEl.alt = d.title || 'Imagem do pedido';
         }
 
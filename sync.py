@@ -0,0 +1,66 @@
+# sync.py
+# Registro compactado de alterações em serviços (models.ServiceChange), gravado na
+# mesma transação da escrita, e a leitura incremental usada por /service/changes.
+# Mudar nome ou e-mail de um usuário também registra os serviços dele, porque os
+# itens sincronizados trazem esses dados no userEntity.
+import sqlalchemy as sa
+
+from models import db, User, Service, ServiceChange
+
+# Chave do lock consultivo que serializa as gravações no registro (PostgreSQL)
+CHANGE_LOG_LOCK_KEY = 0x5e2c
+
+_change_table = ServiceChange.__table__
+
+
+def _lock_change_log(connection):
+    if connection.dialect.name == 'postgresql':
+        # Uma sequência do PostgreSQL é consumida antes do commit: sem serializar,
+        # um seq menor poderia ficar visível depois de um maior e o cliente que já
+        # leu o maior o perderia. O lock vale até o fim da transação.
+        connection.execute(sa.text('SELECT pg_advisory_xact_lock(:key)'), {'key': CHANGE_LOG_LOCK_KEY})
+
+def _record_change(connection, service_id, op):
+    _lock_change_log(connection)
+    connection.execute(_change_table.delete().where(_change_table.c.service_id == service_id))
+    connection.execute(_change_table.insert().values(service_id=service_id, op=op))
+
+def _record_owner_change(connection, user_id):
+    """Upsert de todos os serviços do usuário: o userEntity dos itens traz nome e e-mail do dono."""
+    owned = sa.select(Service.id).where(Service.user_id == user_id)
+    _lock_change_log(connection)
+    connection.execute(_change_table.delete().where(_change_table.c.service_id.in_(owned)))
+    connection.execute(_change_table.insert().from_select(
+        ['service_id', 'op'],
+        sa.select(Service.id, sa.literal(ServiceChange.OP_UPSERT)).where(Service.user_id == user_id).order_by(Service.id)
+    ))
+
+
+@sa.event.listens_for(Service, 'after_insert')
+def _after_service_insert(mapper, connection, service):
+    _record_change(connection, service.id, ServiceChange.OP_UPSERT)
+
+@sa.event.listens_for(Service, 'after_update')
+def _after_service_update(mapper, connection, service):
+    _record_change(connection, service.id, ServiceChange.OP_UPSERT)
+
+@sa.event.listens_for(Service, 'after_delete')
+def _after_service_delete(mapper, connection, service):
+    _record_change(connection, service.id, ServiceChange.OP_DELETE)
+
+@sa.event.listens_for(User, 'after_update')
+def _after_user_update(mapper, connection, user):
+    state = sa.inspect(user)
+    if state.attrs.name.history.has_changes() or state.attrs.email.history.has_changes():
+        _record_owner_change(connection, user.id)
+
+
+def changes_since(since, limit):
+    """Até 'limit' alterações com seq > 'since', em ordem: lista de (seq, service_id, op) e se há mais."""
+    rows = db.session.execute(
+        sa.select(ServiceChange.seq, ServiceChange.service_id, ServiceChange.op)
+        .where(ServiceChange.seq > since)
+        .order_by(ServiceChange.seq)
+        .limit(limit + 1)
+    ).all()
+    return rows[:limit], len(rows) > limit
@@ -0,0 +1,87 @@
+# tests/conftest.py
+# Fixtures comuns: app com banco recriado a cada teste (SQLite em memória, ou o
+# banco de DATABASE_URL), cliente autenticado e criação de serviços pela API.
+import base64
+import os
+import sys
+
+os.environ.setdefault('DATABASE_URL', 'sqlite://')
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+from sqlalchemy import event
+
+import routes
+import search
+from app import app as flask_app
+from cache import ResponseCache, TTLCache
+from models import db
+
+PNG = b'\x89PNG\r\n\x1a\n' + b'\x00' * 64
+PNG_DATA_URL = 'data:image/png;base64,' + base64.b64encode(PNG).decode()
+
+
+@pytest.fixture
+def app(monkeypatch):
+    flask_app.config['TESTING'] = True
+    with flask_app.app_context():
+        db.drop_all()
+        db.create_all()
+    # Caches por processo: ids se repetem entre testes, então cada teste começa vazio
+    routes.category_cache.clear()
+    routes.facet_cache.clear()
+    search.category_suggester.invalidate()
+    monkeypatch.setattr(search, 'trigram_index', search.TrigramIndex())
+    monkeypatch.setattr(routes, 'response_cache', ResponseCache(TTLCache(maxsize=100, ttl=60)))
+    yield flask_app
+
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+
+@pytest.fixture
+def auth(client):
+    """(headers, user_id) de um usuário registrado e logado."""
+    response = client.post('/auth/register', json={
+        'name': 'Ana', 'email': 'ana@example.com', 'phoneNumber': '11999999999',
+        'password': '123456', 'confirmPassword': '123456',
+        'document': base64.b64encode(PNG).decode(),
+    })
+    assert response.status_code == 201, response.get_json()
+    login = client.post('/auth/login', json={'email': 'ana@example.com', 'password': '123456'}).get_json()
+    return {'Authorization': 'Bearer ' + login['access_token']}, login['user_id']
+
+
+@pytest.fixture
+def create_service(client, auth):
+    """Cria um serviço via POST /service/post/<id> e devolve o JSON da resposta."""
+    headers, user_id = auth
+
+    def create(title='Serviço', time_chronos=5, categories=('Design',), **extra):
+        payload = {
+            'title': title, 'description': 'Descrição', 'timeChronos': time_chronos,
+            'categoryEntities': [{'name': name} for name in categories],
+            'serviceImage': PNG_DATA_URL, **extra,
+        }
+        response = client.post(f'/service/post/{user_id}', headers=headers, json=payload)
+        assert response.status_code == 201, response.get_json()
+        return response.get_json()
+
+    return create
+
+
+@pytest.fixture
+def statements(app):
+    """Lista (sql, parâmetros) de cada comando enviado ao banco enquanto o teste roda."""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append((statement, parameters))
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', record)
+    yield executed
+    event.remove(engine, 'before_cursor_execute', record)
@@ -0,0 +1,64 @@
+# tests/test_category_suggestions.py
+# Categoria criada neste worker aparece na sugestão por prefixo sem que a consulta
+# agrupada de todas as categorias (com contagem de uso) rode de novo.
+import threading
+import time
+
+from sqlalchemy import event
+
+import search
+from models import db
+
+
+def _suggest(client, headers, prefix):
+    response = client.get(f'/category/suggest?prefix={prefix}', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return [category['name'] for category in response.get_json()]
+
+
+def test_created_category_is_suggested_without_reload(client, auth, statements, create_service):
+    headers, _ = auth
+    create_service(categories=('Pintura', 'Pintura de parede'))
+    create_service(categories=('Pintura',))
+    assert _suggest(client, headers, 'pin') == ['Pintura', 'Pintura de parede']
+
+    create_service(categories=('Pinhão', 'Jardinagem'))
+    statements.clear()
+    assert _suggest(client, headers, 'pin') == ['Pintura', 'Pintura de parede', 'Pinhão']
+    assert _suggest(client, headers, 'jard') == ['Jardinagem']
+    assert not [sql for sql, _ in statements if 'GROUP BY' in sql]
+
+
+def test_suggestions_are_served_during_reload(app, client, auth, create_service):
+    # Enquanto a consulta agrupada da recarga está parada no banco, outra thread
+    # sugere a partir dos arrays anteriores, sem esperar; uma categoria criada
+    # durante a recarga continua nos arrays novos
+    headers, _ = auth
+    create_service(categories=('Pintura',))
+    assert _suggest(client, headers, 'pin') == ['Pintura']
+
+    started, release = threading.Event(), threading.Event()
+
+    def block_reload(conn, cursor, statement, parameters, context, executemany):
+        if 'GROUP BY' in statement:
+            started.set()
+            release.wait(5)
+
+    with app.app_context():
+        engine = db.engine
+    event.listen(engine, 'before_cursor_execute', block_reload)
+    try:
+        # Recarga periódica vencida (invalidate() esperaria, como na primeira carga)
+        search.category_suggester._loaded_at -= search.CategorySuggester.REFRESH_INTERVAL + 1
+        reload = threading.Thread(target=lambda: _suggest(client, headers, 'pin'))
+        reload.start()
+        assert started.wait(5)
+        began = time.monotonic()
+        assert [item['name'] for item in search.category_suggester.suggest('pin', 10)] == ['Pintura']
+        assert time.monotonic() - began < 1
+        search.category_suggester.add('pinhao', 999, 'Pinhão')
+    finally:
+        release.set()
+        reload.join(5)
+        event.remove(engine, 'before_cursor_execute', block_reload)
+    assert [item['name'] for item in search.category_suggester.suggest('pin', 10)] == ['Pintura', 'Pinhão']
@@ -0,0 +1,90 @@
+# tests/test_commit_hooks.py
+# Alterações coletadas por flush e entregues uma vez, depois do commit, a todos
+# os callbacks de on_commit(); rollback não entrega nada.
+import pytest
+
+import commit_hooks
+from commit_hooks import SERVICE_CREATED, SERVICE_UPDATED, SERVICE_DELETED
+from models import db, User, Service
+
+
+@pytest.fixture
+def delivered(monkeypatch):
+    """Lista das TransactionChanges entregues enquanto o teste roda."""
+    received = []
+    monkeypatch.setattr(commit_hooks, '_callbacks', commit_hooks._callbacks + [received.append])
+    return received
+
+
+def test_service_changes_are_merged_across_flushes(app, create_service, delivered):
+    kept, dropped = create_service(title='Fica'), create_service(title='Sai')
+    delivered.clear()
+    with app.app_context():
+        db.session.get(Service, kept['id']).title = 'Editado'
+        db.session.flush()
+        db.session.delete(db.session.get(Service, dropped['id']))
+        db.session.flush()
+        db.session.commit()
+    assert len(delivered) == 1
+    assert delivered[0].services == {kept['id']: SERVICE_UPDATED, dropped['id']: SERVICE_DELETED}
+
+    delivered.clear()
+    with app.app_context():
+        service = db.session.get(Service, kept['id'])
+        created = Service(title='Temporário', description='x', time_chronos=1, user_id=service.user_id,
+                          service_image=b'')
+        db.session.add(created)
+        db.session.flush()
+        assert commit_hooks.pending_changes(db.session).services == {created.id: SERVICE_CREATED}
+        db.session.delete(created)
+        db.session.commit()
+    # Criado e excluído na mesma transação: nada a entregar
+    assert delivered == []
+
+
+def test_rollback_delivers_nothing(app, create_service, delivered):
+    service = create_service()
+    delivered.clear()
+    with app.app_context():
+        db.session.get(Service, service['id']).title = 'Desfeito'
+        db.session.flush()
+        db.session.rollback()
+        db.session.commit()
+    assert delivered == []
+
+
+def test_user_changes_carry_balance_and_owned_services(app, auth, create_service, delivered):
+    _, user_id = auth
+    service = create_service()
+    delivered.clear()
+    with app.app_context():
+        user = db.session.get(User, user_id)
+        user.time_chronos += 7
+        user.name = 'Ana Maria'
+        db.session.commit()
+    (changes,) = delivered
+    assert changes.services == {}
+    assert changes.owner_services == {service['id']}
+    assert changes.users[user_id].attributes >= {'time_chronos', 'name'}
+    assert changes.users[user_id].time_chronos == 7
+
+
+def test_failing_callback_does_not_break_the_write(client, auth, create_service, monkeypatch, caplog):
+    # O commit já aconteceu: a falha de um callback é registrada no log, a
+    # requisição responde 200 e os callbacks seguintes rodam
+    headers, _ = auth
+    service = create_service(title='Antes')
+    received = []
+
+    def failing(changes):
+        raise ConnectionError('backend fora do ar')
+
+    monkeypatch.setattr(commit_hooks, '_callbacks', [failing] + commit_hooks._callbacks + [received.append])
+    response = client.put(f"/service/put/{service['id']}", headers=headers, json={
+        'title': 'Depois', 'description': 'Descrição', 'timeChronos': 5, 'categoryEntities': [{'name': 'Design'}],
+    })
+    assert response.status_code == 200, response.get_json()
+    assert response.get_json()['title'] == 'Depois'
+    assert [changes.services for changes in received] == [{service['id']: SERVICE_UPDATED}]
+    assert 'backend fora do ar' in caplog.text
+    assert client.get(f"/service/get/{service['id']}").get_json()['title'] == 'Depois'
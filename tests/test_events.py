@@ -0,0 +1,160 @@
+# tests/test_events.py
+# Feeds SSE: fila limitada por assinante (o mais antigo sai e vira 'resync'),
+# publicação só depois do commit, assinatura encerrada junto com a resposta e o
+# saldo em /user/stream (só para o próprio usuário, nada numa venda recusada).
+import json
+
+import pytest
+from flask_jwt_extended import create_access_token
+
+import events
+from events import LocalBroker, SERVICES_CHANNEL, user_channel
+from models import db, Service, User
+
+
+@pytest.fixture
+def broker(app):
+    """LocalBroker novo, registrado com set_broker() enquanto o teste roda."""
+    previous = events.get_broker()
+    broker = LocalBroker()
+    events.set_broker(broker)
+    yield broker
+    events.set_broker(previous)
+
+
+def _parse_events(chunk):
+    """Pares (evento, dados) de um trecho text/event-stream, sem comentários e 'retry'."""
+    parsed = []
+    for block in chunk.split('\n\n'):
+        fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith(':'))
+        if 'event' in fields:
+            parsed.append((fields['event'], json.loads(fields['data'])))
+    return parsed
+
+
+def _open_stream(client, url, headers):
+    """Resposta do feed sem buffer e um leitor que devolve os eventos do próximo trecho."""
+    response = client.get(url, headers=headers, buffered=False)
+    assert response.status_code == 200
+    assert response.mimetype == 'text/event-stream'
+    chunks = iter(response.response)
+
+    def next_events():
+        chunk = next(chunks)
+        return _parse_events(chunk.decode() if isinstance(chunk, bytes) else chunk)
+
+    return response, next_events
+
+
+def test_full_subscription_drops_the_oldest_event(broker):
+    subscription = broker.subscribe('canal', maxsize=2)
+    for i in range(3):
+        broker.publish('canal', ('evento', i))
+    assert subscription.get(0) == ([('evento', 1), ('evento', 2)], 1)
+    # A contagem é zerada a cada leitura
+    assert subscription.get(0) == ([], 0)
+
+
+def test_dropped_events_become_resync(client, auth, broker):
+    headers, _ = auth
+    response, next_events = _open_stream(client, '/service/stream', headers)
+    assert next_events() == []
+
+    for i in range(events.SUBSCRIBER_QUEUE_SIZE + 3):
+        broker.publish(SERVICES_CHANNEL, ('service', {'type': 'updated', 'id': i}))
+    assert next_events() == [('resync', {'dropped': 3})]
+    pending = next_events()
+    assert len(pending) == events.SUBSCRIBER_QUEUE_SIZE
+    assert pending[0] == ('service', {'type': 'updated', 'id': 3})
+    response.close()
+
+
+def test_service_changes_are_published_after_commit(app, client, auth, create_service, broker):
+    headers, _ = auth
+    subscription = broker.subscribe(SERVICES_CHANNEL)
+
+    service = create_service(title='Antes')
+    assert subscription.get(0) == ([('service', {'type': 'created', 'id': service['id']})], 0)
+    response = client.put(f"/service/put/{service['id']}", headers=headers, json={
+        'title': 'Depois', 'description': 'Descrição', 'timeChronos': 5, 'categoryEntities': [{'name': 'Design'}],
+    })
+    assert response.status_code == 200, response.get_json()
+    assert subscription.get(0) == ([('service', {'type': 'updated', 'id': service['id']})], 0)
+
+    with app.app_context():
+        db.session.get(Service, service['id']).title = 'Desfeito'
+        db.session.flush()
+        # Já no banco, mas ainda não confirmado: nada publicado
+        assert subscription.get(0) == ([], 0)
+        db.session.rollback()
+    assert subscription.get(0) == ([], 0)
+
+    response = client.delete(f"/service/delete/{service['id']}", headers=headers)
+    assert response.status_code == 200
+    assert subscription.get(0) == ([('service', {'type': 'deleted', 'id': service['id']})], 0)
+    subscription.close()
+
+
+def test_subscription_is_closed_with_the_response(client, auth, broker):
+    headers, _ = auth
+    response, next_events = _open_stream(client, '/service/stream', headers)
+    assert broker.stats() == {'channels': 1, 'subscribers': 1}
+    next_events()
+    response.close()
+    assert broker.stats() == {'channels': 0, 'subscribers': 0}
+
+
+def _trade(client, headers, operation, amount):
+    return client.put(f'/user/put/{operation}-chronos', headers={**headers, 'Chronos': str(amount)})
+
+
+def test_balance_stream_starts_with_the_current_balance(app, client, auth, broker):
+    headers, user_id = auth
+    with app.app_context():
+        balance = db.session.get(User, user_id).time_chronos
+    response, next_events = _open_stream(client, '/user/stream', headers)
+    assert next_events() == [('balance', {'timeChronos': balance})]
+
+    assert _trade(client, headers, 'buy', 10).status_code == 200
+    assert next_events() == [('balance', {'timeChronos': balance + 10})]
+    response.close()
+    assert broker.stats() == {'channels': 0, 'subscribers': 0}
+
+
+def test_buy_and_sell_publish_only_to_the_affected_user(app, client, auth, broker):
+    headers, user_id = auth
+    with app.app_context():
+        other = User(name='Bruno', email='bruno@example.com', phone_number=11988888888, password_hash='x')
+        db.session.add(other)
+        db.session.commit()
+        other_id, balance = other.id, db.session.get(User, user_id).time_chronos
+    mine, others = broker.subscribe(user_channel(user_id)), broker.subscribe(user_channel(other_id))
+
+    assert _trade(client, headers, 'buy', 10).status_code == 200
+    assert _trade(client, headers, 'sell', 4).status_code == 200
+    assert mine.get(0) == ([('balance', {'timeChronos': balance + 10}),
+                            ('balance', {'timeChronos': balance + 6})], 0)
+    assert others.get(0) == ([], 0)
+
+
+def test_rejected_sell_publishes_nothing(app, client, auth, broker):
+    headers, user_id = auth
+    assert _trade(client, headers, 'buy', 5).status_code == 200
+    with app.app_context():
+        balance = db.session.get(User, user_id).time_chronos
+    subscription = broker.subscribe(user_channel(user_id))
+
+    # Venderia o saldo inteiro (o mínimo é 1 Chronos): recusada, nada muda
+    response = _trade(client, headers, 'sell', balance)
+    assert response.status_code == 400
+    assert subscription.get(0) == ([], 0)
+    with app.app_context():
+        assert db.session.get(User, user_id).time_chronos == balance
+
+
+def test_unknown_user_gets_404_without_a_subscription(app, client, broker):
+    with app.app_context():
+        token = create_access_token(identity='999999')
+    response = client.get('/user/stream', headers={'Authorization': 'Bearer ' + token})
+    assert response.status_code == 404
+    assert broker.stats() == {'channels': 0, 'subscribers': 0}
@@ -0,0 +1,73 @@
+# tests/test_input_validation.py
+# Entradas malformadas ou fora da faixa de 64 bits respondem 400, sem chegar ao
+# banco (onde virariam OverflowError / ArgumentError e um 500).
+import json
+
+import pytest
+
+import routes
+
+HUGE = 10 ** 30
+
+
+@pytest.mark.parametrize('query', [
+    f'min_chronos={HUGE}',
+    f'max_chronos=-{HUGE}',
+    f'limit=5&min_chronos={HUGE}',
+])
+def test_listing_rejects_out_of_range_integers(client, auth, query):
+    headers, _ = auth
+    response = client.get(f'/service/get/all?{query}', headers=headers)
+    assert response.status_code == 400, response.get_json()
+
+
+def test_batch_accepts_bare_list_and_object(client, create_service):
+    first, second = create_service(title='Primeiro'), create_service(title='Segundo')
+    for body in ([second['id'], first['id'], 0], {'ids': [second['id'], first['id'], 0]}):
+        response = client.post('/service/get/batch', json=body)
+        assert response.status_code == 200, response.get_json()
+        data = response.get_json()
+        assert [item['id'] for item in data['items']] == [second['id'], first['id']]
+        assert data['missing'] == [0]
+
+
+@pytest.mark.parametrize('body', ['1,2', 7, None, {'ids': 'x'}, [True], [HUGE], {'ids': [-HUGE]}])
+def test_batch_rejects_invalid_bodies(client, body):
+    # json.dumps: o provedor JSON do app (orjson) não codifica inteiros acima de 64 bits
+    response = client.post('/service/get/batch', data=json.dumps(body), content_type='application/json')
+    assert response.status_code == 400, response.get_json()
+
+
+def test_batch_rejects_out_of_range_query_ids(client):
+    response = client.get(f'/service/get/batch?ids=1,{HUGE}')
+    assert response.status_code == 400, response.get_json()
+
+
+@pytest.mark.parametrize('sort, cursor', [
+    ('chronos_asc', ['chronos_asc', True, 1]),
+    ('chronos_asc', ['chronos_asc', 5, True]),
+    ('chronos_asc', ['chronos_asc', HUGE, 1]),
+    (None, [None, None, HUGE]),
+    ('deadline_asc', ['deadline_asc', False, 1]),
+])
+def test_listing_rejects_crafted_cursors(client, auth, create_service, sort, cursor):
+    headers, _ = auth
+    create_service()
+    url = '/service/get/all?limit=1&cursor=' + routes._encode_cursor(cursor)
+    if sort:
+        url += f'&sort={sort}'
+    response = client.get(url, headers=headers)
+    assert response.status_code == 400, response.get_json()
+
+
+@pytest.mark.parametrize('url', [
+    '/service/search?q=pintura&limit=0',
+    '/service/search?q=pintura&limit=-1',
+    '/service/changes?limit=0',
+    '/service/facets?facet_limit=0',
+    '/category/suggest?prefix=pin&limit=0',
+])
+def test_limit_must_be_positive(client, auth, url):
+    headers, _ = auth
+    response = client.get(url, headers=headers)
+    assert response.status_code == 400, response.get_json()
@@ -0,0 +1,79 @@
+# tests/test_query_plans.py
+# As consultas da listagem (páginas keyset em cada ordenação), do dono
+# (/user/services) e por categoria precisam usar índices: o teste roda EXPLAIN
+# em cada SELECT que a rota envia e falha se services ou service_categories forem
+# percorridas por inteiro. No SQLite usa EXPLAIN QUERY PLAN; no PostgreSQL
+# (DATABASE_URL), EXPLAIN com enable_seqscan desligado, porque em tabelas
+# pequenas o planejador prefere a varredura mesmo havendo índice.
+import pytest
+
+from models import db
+
+FULL_SCANS = {
+    'sqlite': ('SCAN services', 'SCAN service_categories'),
+    'postgresql': ('Seq Scan on services', 'Seq Scan on service_categories'),
+}
+
+
+def _explain(connection, statement, parameters):
+    dialect = connection.dialect.name
+    if dialect == 'sqlite':
+        return [row[-1] for row in connection.exec_driver_sql('EXPLAIN QUERY PLAN ' + statement, parameters)]
+    connection.exec_driver_sql('SET enable_seqscan = off')
+    return [row[0].strip() for row in connection.exec_driver_sql('EXPLAIN ' + statement, parameters)]
+
+
+def _full_scans(app, client, headers, statements, url):
+    """Passos de varredura completa nos SELECTs enviados por GET 'url'."""
+    statements.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    selects = [(sql, params) for sql, params in statements if sql.lstrip().upper().startswith('SELECT')]
+    assert selects
+
+    scans = []
+    with app.app_context():
+        with db.engine.connect() as connection:
+            dialect = connection.dialect.name
+            if dialect not in FULL_SCANS:
+                pytest.skip(f'EXPLAIN não verificado para {dialect}')
+            for sql, params in selects:
+                for step in _explain(connection, sql, params):
+                    if step.startswith(FULL_SCANS[dialect]):
+                        scans.append((step, sql))
+            connection.rollback()
+    return response, scans
+
+
+@pytest.fixture
+def catalog(create_service):
+    for i in range(12):
+        create_service(title=f'Serviço {i}', time_chronos=i % 4 + 1,
+                       categories=('Design', 'Pintura') if i % 3 else ('Reforma',),
+                       deadline=f'2026-11-{i % 5 + 1:02d}')
+
+
+@pytest.mark.parametrize('sort', ['', 'newest', 'chronos_asc', 'chronos_desc', 'deadline_asc', 'deadline_desc'])
+def test_listing_pages_use_indexes(app, client, auth, statements, catalog, sort):
+    headers, _ = auth
+    url = f'/service/get/all?limit=3&sort={sort}' if sort else '/service/get/all?limit=3'
+    first = client.get(url, headers=headers).get_json()
+    # A primeira página percorre o índice só até o LIMIT; as seguintes buscam a partir do cursor
+    _, scans = _full_scans(app, client, headers, statements, f"{url}&cursor={first['next_cursor']}")
+    assert scans == []
+
+
+def test_owner_listing_uses_index(app, client, auth, statements, catalog):
+    headers, _ = auth
+    response, scans = _full_scans(app, client, headers, statements, '/user/services?limit=3')
+    assert scans == []
+    _, scans = _full_scans(app, client, headers, statements,
+                           f"/user/services?limit=3&cursor={response.get_json()['next_cursor']}")
+    assert scans == []
+
+
+def test_category_listing_uses_index(app, client, auth, statements, catalog):
+    headers, _ = auth
+    response, scans = _full_scans(app, client, headers, statements, '/service/get/all?limit=3&category=reforma')
+    assert scans == []
+    assert response.get_json()['items']
@@ -0,0 +1,201 @@
+# tests/test_response_cache.py
+# Cache de respostas: gravação descartada quando uma remoção acontece entre
+# generation() e set(), remoção precisa depois do commit (todas as variantes de
+# fields=, serviços do dono renomeado, nada num rollback) e ponteiros
+# compartilhados entre workers por um SharedCache. Os cenários com o cliente rodam
+# sem e com backend compartilhado; sem ele, a versão é sempre lida do banco (um
+# comando) e um acerto poupa só a leitura completa e a serialização.
+import pytest
+
+import routes
+from cache import LocalSharedCache, ResponseCache, SharedCache, TTLCache
+from models import db, User, Service
+
+
+def _new_cache(shared=None):
+    return ResponseCache(TTLCache(maxsize=100, ttl=60), shared)
+
+
+@pytest.fixture(params=['local', 'shared'])
+def response_cache(app, monkeypatch, request):
+    cache = _new_cache(LocalSharedCache() if request.param == 'shared' else None)
+    monkeypatch.setattr(routes, 'response_cache', cache)
+    return cache
+
+
+def _cached_statements(cache):
+    """Comandos SQL de uma leitura respondida pelo cache."""
+    return 0 if cache.shared is not None else 1
+
+
+def _get(client, statements, url):
+    """(corpo, quantidade de comandos SQL) de GET 'url'."""
+    statements.clear()
+    response = client.get(url)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json(), len(statements)
+
+
+def _update(client, headers, service_id, title):
+    response = client.put(f'/service/put/{service_id}', headers=headers, json={
+        'title': title, 'description': 'Descrição', 'timeChronos': 5, 'categoryEntities': [{'name': 'Design'}],
+    })
+    assert response.status_code == 200, response.get_json()
+
+
+def test_eviction_between_generation_and_set_drops_the_fill():
+    cache = _new_cache(LocalSharedCache())
+    generation = cache.generation('service', 1)
+    cache.evict('service', 1)
+    assert cache.set('service', 1, generation, 'v1', '', 'etag-1', None, b'{"old": true}') is False
+    assert cache.get('service', 1, '') is None
+    assert cache.stats()['staleWritesDropped'] == 1
+
+    generation = cache.generation('service', 1)
+    assert cache.set('service', 1, generation, 'v2', '', 'etag-2', None, b'{"new": true}') is True
+    assert cache.get('service', 1, '') == ('etag-2', None, b'{"new": true}')
+
+
+def test_workers_share_pointers_through_shared_cache():
+    shared = LocalSharedCache()
+    worker_a, worker_b = _new_cache(shared), _new_cache(shared)
+
+    generation = worker_a.generation('user', 7)
+    assert worker_a.set('user', 7, generation, 'v1', '', 'etag-1', None, b'{}')
+    # A entrada chega ao outro worker pelo backend e fica no LRU local dele
+    assert worker_b.get('user', 7, '') == ('etag-1', None, b'{}')
+    assert worker_b.local.stats()['size'] == 1
+
+    # Uma remoção em um worker vale para o outro, mesmo com a entrada no LRU local
+    worker_b.evict('user', 7)
+    assert worker_a.get('user', 7, '') is None
+    assert worker_b.get('user', 7, '') is None
+    # E uma leitura de A que começou antes da remoção não regrava a versão antiga
+    assert worker_a.set('user', 7, generation, 'v1', '', 'etag-1', None, b'{}') is False
+
+
+def test_local_entries_are_looked_up_by_version():
+    cache = _new_cache()
+    assert cache.set('service', 1, cache.generation('service', 1), 'v1', '', 'etag-1', None, b'{}') is True
+    # Sem backend compartilhado não há ponteiro: só quem leu a versão no banco acerta
+    assert cache.get('service', 1, '') is None
+    assert cache.get('service', 1, '', 'v1') == ('etag-1', None, b'{}')
+    assert cache.get('service', 1, '', 'v2') is None
+
+
+def test_read_racing_a_write_does_not_fill(app, client, statements, create_service, monkeypatch):
+    response_cache = _new_cache(LocalSharedCache())
+    monkeypatch.setattr(routes, 'response_cache', response_cache)
+    service = create_service()
+    generation = response_cache.generation
+
+    def evict_after_generation(resource, resource_id):
+        # Uma escrita confirmada logo depois de a leitura capturar a geração
+        value = generation(resource, resource_id)
+        response_cache.evict(resource, resource_id)
+        return value
+
+    response_cache.generation = evict_after_generation
+    _get(client, statements, f"/service/get/{service['id']}")
+    del response_cache.generation
+    # O ponteiro não foi gravado: a leitura seguinte volta ao banco pela versão
+    assert response_cache.stale_writes == 1
+    assert response_cache.get('service', service['id'], '[]') is None
+    _, count = _get(client, statements, f"/service/get/{service['id']}")
+    assert count > 0
+
+
+def test_update_evicts_every_fields_variant(client, auth, statements, create_service, response_cache):
+    headers, _ = auth
+    service = create_service(title='Antes')
+    urls = [f"/service/get/{service['id']}", f"/service/get/{service['id']}?fields=title",
+            f"/service/get/{service['id']}?fields=id,title"]
+    for url in urls:
+        _get(client, statements, url)
+        body, count = _get(client, statements, url)
+        assert count == _cached_statements(response_cache) and body['title'] == 'Antes'
+
+    _update(client, headers, service['id'], 'Depois')
+    for url in urls:
+        body, count = _get(client, statements, url)
+        assert count > 1 and body['title'] == 'Depois'
+
+
+def test_owner_rename_evicts_owned_services(app, client, auth, statements, create_service, response_cache):
+    _, user_id = auth
+    owned = [create_service(title=f'Serviço {i}')['id'] for i in range(2)]
+    for service_id in owned:
+        _get(client, statements, f'/service/get/{service_id}')
+    _get(client, statements, f'/user/get/{user_id}')
+
+    with app.app_context():
+        db.session.get(User, user_id).name = 'Ana Maria'
+        db.session.commit()
+    for service_id in owned:
+        body, count = _get(client, statements, f'/service/get/{service_id}')
+        assert count > 1 and body['userEntity']['name'] == 'Ana Maria'
+    body, count = _get(client, statements, f'/user/get/{user_id}')
+    assert count > 1 and body['name'] == 'Ana Maria'
+
+
+def test_rollback_evicts_nothing(app, client, statements, create_service, response_cache):
+    service = create_service(title='Mantido')
+    url = f"/service/get/{service['id']}"
+    _get(client, statements, url)
+
+    with app.app_context():
+        db.session.get(Service, service['id']).title = 'Desfeito'
+        db.session.flush()
+        db.session.rollback()
+    body, count = _get(client, statements, url)
+    assert count == _cached_statements(response_cache) and body['title'] == 'Mantido'
+
+
+def test_write_in_another_worker_is_seen_without_eviction(app, client, auth, create_service, monkeypatch):
+    # Sem backend compartilhado, a remoção só acontece no worker que escreveu; os
+    # demais ainda precisam entregar a versão nova (e não 304 para o ETag antigo)
+    headers, _ = auth
+    service = create_service(title='Antes')
+    url = f"/service/get/{service['id']}"
+    first = client.get(url)
+    assert client.get(url).get_json()['title'] == 'Antes'
+
+    monkeypatch.setattr(routes.response_cache, 'evict', lambda resource, resource_id: None)
+    _update(client, headers, service['id'], 'Depois')
+    assert client.get(url).get_json()['title'] == 'Depois'
+    revalidated = client.get(url, headers={'If-None-Match': first.headers['ETag']})
+    assert revalidated.status_code == 200 and revalidated.get_json()['title'] == 'Depois'
+
+
+def test_unavailable_shared_backend_does_not_fail_writes(app, client, auth, create_service, monkeypatch):
+    class Unavailable(LocalSharedCache):
+        def incr(self, key):
+            raise ConnectionError('backend fora do ar')
+
+    monkeypatch.setattr(routes, 'response_cache', _new_cache(Unavailable()))
+    headers, _ = auth
+    service = create_service(title='Antes')
+    client.get(f"/service/get/{service['id']}")
+    response = client.put(f"/service/put/{service['id']}", headers=headers, json={
+        'title': 'Depois', 'description': 'Descrição', 'timeChronos': 5, 'categoryEntities': [{'name': 'Design'}],
+    })
+    assert response.status_code == 200, response.get_json()
+
+
+def test_configure_response_cache(app, monkeypatch):
+    monkeypatch.setattr(routes, 'response_cache', _new_cache())
+    routes.configure_response_cache(None)
+    assert routes.response_cache.shared is None
+
+    routes.configure_response_cache('cache:LocalSharedCache')
+    assert isinstance(routes.response_cache.shared, LocalSharedCache)
+    assert 'shared' in routes.response_cache.stats()
+
+    class Incomplete(SharedCache):
+        def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        routes.configure_response_cache(Incomplete)
+    with pytest.raises(TypeError):
+        routes.configure_response_cache(dict)
@@ -0,0 +1,32 @@
+# tests/test_search.py
+# Busca: tabela FTS5 criada e removida junto com 'services'; filtros da busca
+# aproximada aplicados a todos os candidatos, e não só aos mais parecidos.
+import sqlalchemy as sa
+
+import search
+from search import FTS_TABLE
+from models import db
+
+
+def test_drop_all_removes_the_fts_table(app, create_service):
+    create_service(title='Aula de violão')
+    with app.app_context():
+        assert db.session.execute(sa.text(f'SELECT count(*) FROM {FTS_TABLE}')).scalar() == 1
+        db.drop_all()
+        assert FTS_TABLE not in sa.inspect(db.engine).get_table_names()
+        db.create_all()
+        # Recriada vazia: nenhuma linha de um id que será reusado
+        assert db.session.execute(sa.text(f'SELECT count(*) FROM {FTS_TABLE}')).scalar() == 0
+
+
+def test_fuzzy_filters_apply_beyond_the_first_candidates(client, auth, create_service, monkeypatch):
+    headers, _ = auth
+    monkeypatch.setattr(search, 'MAX_FUZZY_CANDIDATES', 2)
+    for _ in range(3):
+        create_service(title='Aula de violão', time_chronos=5)
+    # Menos parecidos que os de cima, mas os únicos dentro do filtro de tempo
+    wanted = [create_service(title=f'Aulas de violões {i}', time_chronos=20)['id'] for i in range(2)]
+
+    response = client.get('/service/search?q=violao&fuzzy=1&min_chronos=10&limit=5', headers=headers)
+    assert response.status_code == 200, response.get_json()
+    assert [item['id'] for item in response.get_json()['items']] == wanted
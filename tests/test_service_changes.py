@@ -0,0 +1,89 @@
+# tests/test_service_changes.py
+# /service/changes: paginação por 'since'/'has_more', exclusões como tombstones,
+# registro compactado (uma linha por serviço) e renomeação do dono.
+from models import db, User, ServiceChange
+
+
+def _changes(client, headers, since=0, limit=None):
+    url = f'/service/changes?since={since}' + (f'&limit={limit}' if limit else '')
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return response.get_json()
+
+
+def _sync(client, headers, since=0, limit=2):
+    """Segue 'next_since' até has_more ser falso; devolve (ids alterados, ids excluídos, since final)."""
+    upserted, deleted = [], []
+    while True:
+        page = _changes(client, headers, since, limit)
+        assert len(page['items']) + len(page['deleted']) <= limit
+        upserted += [item['id'] for item in page['items']]
+        deleted += page['deleted']
+        since = page['next_since']
+        if not page['has_more']:
+            return upserted, deleted, since
+
+
+def test_paging_with_since_and_has_more(client, auth, create_service):
+    headers, _ = auth
+    ids = [create_service(title=f'Serviço {i}')['id'] for i in range(5)]
+
+    first = _changes(client, headers, limit=2)
+    assert [item['id'] for item in first['items']] == ids[:2]
+    assert first['has_more'] is True
+
+    upserted, deleted, since = _sync(client, headers)
+    assert upserted == ids and deleted == []
+    # Nada novo: a mesma posição volta, sem itens
+    assert _changes(client, headers, since) == {'items': [], 'deleted': [], 'next_since': since, 'has_more': False}
+
+    newer = create_service(title='Novo')['id']
+    assert _sync(client, headers, since)[:2] == ([newer], [])
+
+
+def test_deleted_services_become_tombstones(client, auth, create_service):
+    headers, _ = auth
+    kept, removed = create_service(title='Fica')['id'], create_service(title='Sai')['id']
+    _, _, since = _sync(client, headers)
+
+    response = client.delete(f'/service/delete/{removed}', headers=headers)
+    assert response.status_code == 200
+    assert _sync(client, headers, since)[:2] == ([], [removed])
+    # Sincronização do zero: o excluído só aparece como tombstone
+    assert _sync(client, headers)[:2] == ([kept], [removed])
+
+
+def test_change_log_is_compacted(app, client, auth, create_service):
+    headers, _ = auth
+    first, second = create_service(title='Primeiro')['id'], create_service(title='Segundo')['id']
+    for title in ('Editado', 'Editado de novo'):
+        response = client.put(f'/service/put/{first}', headers=headers, json={
+            'title': title, 'description': 'Descrição', 'timeChronos': 5,
+            'categoryEntities': [{'name': 'Design'}],
+        })
+        assert response.status_code == 200, response.get_json()
+
+    with app.app_context():
+        assert db.session.query(ServiceChange.service_id).order_by(ServiceChange.seq).all() == [(second,), (first,)]
+    upserted, _, _ = _sync(client, headers)
+    assert upserted == [second, first]
+    assert _changes(client, headers)['items'][1]['title'] == 'Editado de novo'
+
+
+def test_owner_rename_records_owned_services(app, client, auth, create_service):
+    headers, user_id = auth
+    ids = [create_service(title=f'Serviço {i}')['id'] for i in range(3)]
+    _, _, since = _sync(client, headers)
+
+    with app.app_context():
+        db.session.get(User, user_id).time_chronos += 1
+        db.session.commit()
+    # Saldo não aparece nos itens: nada a sincronizar
+    assert _sync(client, headers, since)[:2] == ([], [])
+
+    with app.app_context():
+        db.session.get(User, user_id).name = 'Ana Maria'
+        db.session.commit()
+    page = _changes(client, headers, since)
+    assert [item['id'] for item in page['items']] == ids
+    assert {item['userEntity']['name'] for item in page['items']} == {'Ana Maria'}
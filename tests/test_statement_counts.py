@@ -0,0 +1,38 @@
+# tests/test_statement_counts.py
+# Sem N+1: a quantidade de comandos SQL de uma leitura não pode crescer com o
+# número de serviços listados (nem com o de categorias de um serviço).
+import pytest
+
+
+def _count(client, headers, statements, url):
+    statements.clear()
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.get_json()
+    return len(statements), response.get_json()
+
+
+@pytest.mark.parametrize('url', ['/service/get/all', '/service/get/all?limit=50'])
+def test_listing_statement_count_is_constant(client, auth, statements, create_service, url):
+    headers, _ = auth
+    counts = {}
+    created = 0
+    for total in (1, 5, 20):
+        while created < total:
+            create_service(title=f'Serviço {created}', categories=('Design', f'Categoria {created}'))
+            created += 1
+        counts[total], body = _count(client, headers, statements, url)
+        items = body if isinstance(body, list) else body['items']
+        assert len(items) == total
+        assert all(len(item['categoryEntities']) == 2 and item['userEntity'] for item in items)
+    assert counts[1] == counts[5] == counts[20], counts
+
+
+def test_service_by_id_statement_count_is_constant(client, auth, statements, create_service):
+    headers, _ = auth
+    counts = {}
+    for total in (1, 5, 20):
+        service = create_service(categories=[f'Categoria {total}-{i}' for i in range(total)])
+        # Serviço novo: a primeira leitura não vem do cache de respostas
+        counts[total], body = _count(client, headers, statements, f"/service/get/{service['id']}")
+        assert len(body['categoryEntities']) == total
+    assert counts[1] == counts[5] == counts[20], counts